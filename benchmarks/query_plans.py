@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+
+"""
+Event query plans benchmark.
+
+Prints query plans and timings of the event queries without and with the
+event indexes, i.e. ``index_together`` and ``task_id`` indexes added by
+``0004_event_indexes`` and ``0006_event_updated_at`` migrations. Events are
+created at the latest migration, indexes are dropped and recreated by
+migration operations. Uses SQLite database by default, pass
+Django database settings through environment to benchmark another database::
+
+    python benchmarks/query_plans.py --rows 100000
+    DB_ENGINE=django.db.backends.postgresql_psycopg2 DB_NAME=events \\
+        python benchmarks/query_plans.py
+
+Database is flushed, use scratch database only.
+"""
+
+
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from django.conf import settings
+
+settings.configure(
+    DEBUG=False,
+    INSTALLED_APPS=(
+        'django.contrib.auth',
+        'django.contrib.contenttypes',
+        'django_event',
+    ),
+    DATABASES={
+        'default': {
+            'ENGINE': os.environ.get('DB_ENGINE',
+                                     'django.db.backends.sqlite3'),
+            'NAME': os.environ.get('DB_NAME', '/tmp/django_event_bench.db'),
+            'USER': os.environ.get('DB_USER', ''),
+            'PASSWORD': os.environ.get('DB_PASSWORD', ''),
+            'HOST': os.environ.get('DB_HOST', ''),
+            'PORT': os.environ.get('DB_PORT', ''),
+        }
+    },
+    MIDDLEWARE_CLASSES=(),
+    USE_TZ=True,
+    DJANGO_EVENT={'BACKEND': 'redis', 'BACKEND_OPTIONS': {'PORT': 6379}},
+)
+
+import django
+django.setup()
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.db import migrations
+from django.db import models
+from django.db.migrations.loader import MigrationLoader
+from django.utils import timezone
+
+from django_event.models import Event
+
+
+# Drop event indexes added by 0004_event_indexes and 0006_event_updated_at.
+DROP_INDEXES = (
+    migrations.AlterIndexTogether(name='event', index_together=set()),
+    migrations.AlterField(
+        model_name='event',
+        name='task_id',
+        field=models.CharField(max_length=256, null=True),
+    ),
+)
+
+
+def queries(user, task_id):
+    """
+    Benchmarked queries.
+    """
+
+    user_events = Event.objects.filter(user=user)
+    return (
+        ('user list', user_events.order_by('-completed_at')[:10]),
+        ('user not viewed', user_events.not_viewed()),
+        ('old viewed', Event.objects.viewed().old()),
+        ('user failed', user_events.failed()),
+        ('task id', Event.objects.filter(task_id=task_id)),
+        ('user last update', user_events.order_by('-updated_at')[:1]),
+    )
+
+
+def explain(queryset):
+    """
+    Returns query plan lines.
+    """
+
+    sql, params = queryset.query.sql_with_params()
+    if connection.vendor == 'sqlite':
+        sql = 'EXPLAIN QUERY PLAN ' + sql
+    else:
+        sql = 'EXPLAIN ' + sql
+    cursor = connection.cursor()
+    cursor.execute(sql, params)
+    return [' '.join(map(str, row)) for row in cursor.fetchall()]
+
+
+def timeit(queryset, repeat):
+    """
+    Returns average query time in milliseconds. Only primary keys are
+    fetched to keep model instantiation out of measurements.
+    """
+
+    started = time.time()
+    for _ in range(repeat):
+        list(queryset.values_list('pk', flat=True))
+    return (time.time() - started) * 1000 / repeat
+
+
+def populate(rows, users):
+    """
+    Creates random events.
+    """
+
+    user_list = [
+        User.objects.create(username='bench%s' % index)
+        for index in range(users)
+    ]
+    now = timezone.now()
+    batch = []
+    for index in range(rows):
+        completed = random.random() < 0.9
+        batch.append(Event(
+            user=random.choice(user_list),
+            type='bench',
+            task_id='task-%s' % index,
+            task_name='bench',
+            started=True,
+            started_at=now,
+            completed=completed,
+            completed_at=(
+                now - timedelta(hours=random.randint(0, 24 * 30))
+                if completed else None
+            ),
+            viewed=random.random() < 0.7,
+            status=random.random() < 0.95,
+        ))
+        if len(batch) == 1000:
+            Event.objects.bulk_create(batch)
+            batch = []
+    Event.objects.bulk_create(batch)
+    if connection.vendor == 'postgresql':
+        connection.cursor().execute('ANALYZE %s' % Event._meta.db_table)
+    return user_list[0], 'task-%s' % (rows // 2)
+
+
+def set_indexes(enabled):
+    """
+    Creates or drops event indexes by applying or unapplying index drop
+    operations to the latest migration state, as migrate command does.
+    """
+
+    states = [MigrationLoader(connection).project_state()]
+    for operation in DROP_INDEXES:
+        state = states[-1].clone()
+        operation.state_forwards('django_event', state)
+        states.append(state)
+
+    with connection.schema_editor() as schema_editor:
+        if enabled:
+            for index, operation in reversed(list(enumerate(DROP_INDEXES))):
+                operation.database_backwards('django_event', schema_editor,
+                                             states[index + 1], states[index])
+        else:
+            for index, operation in enumerate(DROP_INDEXES):
+                operation.database_forwards('django_event', schema_editor,
+                                            states[index], states[index + 1])
+    if connection.vendor == 'postgresql':
+        connection.cursor().execute('ANALYZE %s' % Event._meta.db_table)
+
+
+def report(title, user, task_id, repeat):
+    print('=' * 79)
+    print(title)
+    print('=' * 79)
+    for name, queryset in queries(user, task_id):
+        print('%s: %.2f ms' % (name, timeit(queryset, repeat)))
+        for line in explain(queryset):
+            print('    %s' % line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    call_command('migrate', verbosity=0)
+    call_command('flush', interactive=False, verbosity=0)
+    user, task_id = populate(args.rows, args.users)
+
+    set_indexes(False)
+    try:
+        report('Without event indexes', user, task_id, args.repeat)
+    finally:
+        set_indexes(True)
+    report('With event indexes', user, task_id, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
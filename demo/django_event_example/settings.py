@@ -134,5 +134,8 @@ DJANGO_EVENT = {
         'example_event_type':
         'django_event.subscriber.listeners.SendMessageListener',
     },
+    'ROUTING_STRATEGIES': {
+        'example_event_type': ('user.id', ),
+    },
     'STORE_DAYS': 7,
 }
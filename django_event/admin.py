@@ -17,6 +17,7 @@ class EventAdmin(admin.ModelAdmin):
         'type',
         'status',
         'result',
+        'progress',
 
         'created_at',
         'started',
@@ -0,0 +1,294 @@
+# -*- coding: utf-8 -*-
+
+"""
+Event archive module.
+
+Events are archived into gzip compressed newline delimited JSON files, one
+file per completion day and batch named by day and the first event id e.g.
+``events-2015-01-31-1042.json.gz``.
+
+Batch files are written under temporary names and renamed only after the
+batch deletion is committed, so interrupted runs don't archive events
+twice. Temporary files left by interrupted runs are recovered on the next
+run: kept if their events were deleted, removed otherwise.
+"""
+
+
+from __future__ import unicode_literals
+
+import gzip
+import io
+import json
+import os
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+
+
+class ArchiveError(Exception):
+    """
+    Archive verification error. Batch is not deleted if raised.
+    """
+
+
+class EventArchive(object):
+    """
+    Per day event archive in given directory.
+    """
+
+    file_name_format = 'events-%s-%s.json.gz'
+    temp_suffix = '.tmp'
+    # Ids checked per query while recovering temporary files.
+    recover_chunk_size = 500
+
+    def __init__(self, directory):
+        """
+        Initialize archive.
+
+        :param directory: Archive directory, created if missing.
+        :type directory: :class:`str`
+        """
+
+        self.directory = directory
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def get_path(self, day, first_pk):
+        """
+        Get archive file path.
+
+        :param day: Archived events completion date.
+        :type day: :class:`datetime.date`
+
+        :param first_pk: The first archived event id.
+        :type first_pk: :class:`int`
+
+        :return: File path.
+        :rtype: :class:`str`
+        """
+
+        return os.path.join(self.directory, self.file_name_format % (
+            day.isoformat(), first_pk
+        ))
+
+    @staticmethod
+    def get_day(row):
+        """
+        Get archive day of event row.
+
+        :param row: Event values.
+        :type row: :class:`dict`
+
+        :return: Event completion date, creation date if not completed.
+        :rtype: :class:`datetime.date`
+        """
+
+        value = row.get('completed_at') or row['created_at']
+        if timezone.is_aware(value):
+            value = value.astimezone(timezone.utc)
+        return value.date()
+
+    @staticmethod
+    def compress(rows):
+        """
+        Compresses rows into single gzip member. Compressed data is read back
+        to verify rows count.
+
+        :param rows: Event values.
+        :type rows: :class:`list`
+
+        :return: Compressed newline delimited JSON.
+        :rtype: :class:`bytes`
+
+        :raise: :class:`ArchiveError` if data can't be read back.
+        """
+
+        buf = io.BytesIO()
+        with gzip.GzipFile(fileobj=buf, mode='wb') as gzip_file:
+            for row in rows:
+                gzip_file.write(
+                    json.dumps(row, cls=DjangoJSONEncoder).encode('utf-8')
+                )
+                gzip_file.write(b'\n')
+        data = buf.getvalue()
+
+        buf = io.BytesIO(data)
+        with gzip.GzipFile(fileobj=buf, mode='rb') as gzip_file:
+            written = sum(1 for _ in gzip_file)
+        if written != len(rows):
+            raise ArchiveError('Compressed %s events, read back %s' % (
+                len(rows), written
+            ))
+        return data
+
+    @staticmethod
+    def read(path):
+        """
+        Reads archived events.
+
+        :param path: Archive file path.
+        :type path: :class:`str`
+
+        :return: Generator of event values.
+        :rtype: :class:`dict`
+        """
+
+        with gzip.open(path, 'rb') as gzip_file:
+            for line in gzip_file:
+                yield json.loads(line.decode('utf-8'))
+
+    def save(self, path, data):
+        """
+        Writes compressed data to file and flushes it to disk.
+
+        :param path: File path.
+        :type path: :class:`str`
+
+        :param data: Compressed data.
+        :type data: :class:`bytes`
+        """
+
+        with open(path, 'wb') as archive_file:
+            archive_file.write(data)
+            archive_file.flush()
+            os.fsync(archive_file.fileno())
+            if archive_file.tell() != len(data):
+                raise ArchiveError('Archive %s is truncated' % path)
+
+    def sync(self):
+        """
+        Flushes archive directory entries to disk.
+        """
+
+        fd = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def write(self, rows, pk_name='id'):
+        """
+        Writes events into per day temporary archive files.
+
+        :param rows: Event values.
+        :type rows: :class:`list`
+
+        :param pk_name: Primary key field name.
+        :type pk_name: :class:`str`
+
+        :return: Archive file paths.
+        :rtype: :class:`list`
+        """
+
+        days = {}
+        for row in rows:
+            days.setdefault(self.get_day(row), []).append(row)
+
+        paths = []
+        try:
+            for day, day_rows in sorted(days.items()):
+                path = self.get_path(day, day_rows[0][pk_name])
+                paths.append(path)
+                self.save(path + self.temp_suffix, self.compress(day_rows))
+        except Exception:
+            self.discard(paths)
+            raise
+        return paths
+
+    def commit(self, paths):
+        """
+        Renames temporary archive files to their final names.
+
+        :param paths: Archive file paths.
+        :type paths: :class:`list`
+        """
+
+        for path in paths:
+            os.rename(path + self.temp_suffix, path)
+        self.sync()
+
+    def discard(self, paths):
+        """
+        Removes temporary archive files.
+
+        :param paths: Archive file paths.
+        :type paths: :class:`list`
+        """
+
+        for path in paths:
+            if os.path.exists(path + self.temp_suffix):
+                os.remove(path + self.temp_suffix)
+
+    def recover(self, model, using='default'):
+        """
+        Recovers temporary files left by interrupted run. File is committed
+        if none of its events exists, i.e. batch deletion was committed, and
+        removed otherwise as its events will be archived again.
+
+        :param model: Event model.
+        :type model: :class:`AbstractBaseEvent` subclass
+
+        :param using: Database alias.
+        :type using: :class:`str`
+
+        :return: Committed file paths.
+        :rtype: :class:`list`
+        """
+
+        pk_name = model._meta.pk.attname
+        manager = model._base_manager.using(using)
+        committed = []
+        for name in sorted(os.listdir(self.directory)):
+            if not name.endswith(self.temp_suffix):
+                continue
+            path = os.path.join(self.directory, name[:-len(self.temp_suffix)])
+            pks = [row[pk_name] for row in self.read(path + self.temp_suffix)]
+            exists = any(
+                manager.filter(
+                    pk__in=pks[i:i + self.recover_chunk_size]
+                ).exists()
+                for i in range(0, len(pks), self.recover_chunk_size)
+            )
+            if exists:
+                self.discard([path])
+            else:
+                self.commit([path])
+                committed.append(path)
+        return committed
+
+    def archive(self, queryset, batch_size=None, sleep=0, time_budget=None):
+        """
+        Archives and deletes events by batches. Batch is deleted only after
+        it was written and verified, deleted rows count is checked as well.
+        Batch files get their final names after deletion is committed.
+        See :func:`EventQuerySet.batches` for parameters.
+
+        :param queryset: Events to be archived.
+        :type queryset: :class:`EventQuerySet`
+
+        :return: Generator of archived events count per batch.
+        :rtype: :class:`int`
+
+        :raise: :class:`ArchiveError` if verification failed.
+        """
+
+        pk_name = queryset.model._meta.pk.attname
+        self.recover(queryset.model, queryset.db)
+        for rows in queryset.batches(batch_size, sleep, time_budget):
+            paths = self.write(rows, pk_name)
+            try:
+                with transaction.atomic(using=queryset.db):
+                    deleted = queryset.delete_pks(
+                        [row[pk_name] for row in rows])
+                    if deleted != len(rows):
+                        raise ArchiveError(
+                            'Archived %s events, but %s would be deleted' % (
+                                len(rows), deleted
+                            )
+                        )
+            except Exception:
+                self.discard(paths)
+                raise
+            self.commit(paths)
+            yield len(rows)
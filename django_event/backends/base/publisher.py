@@ -6,16 +6,68 @@ Backend base subscribed module.
 
 from __future__ import unicode_literals
 
+from django_event.backends.base import settings
+
 
 class BasePublisher(object):
 
     def __init__(self, *args, **kwargs):
         """
         Initialize publisher.
+
+        :param persistent: Keep connection open after the last release.
+        :type persistent: :class:`bool`
         """
 
+        self.persistent = kwargs.pop('persistent',
+                                     settings.PERSISTENT_CONNECTION)
+
         super(BasePublisher, self).__init__(*args, **kwargs)
 
+        self._acquired = 0
+
+    @property
+    def is_connected(self):
+        """
+        Checks if publisher connection is alive.
+
+        :return: True if connected.
+        :rtype: :class:`bool`
+
+        :raises: :class:`NotImplementedError`
+        """
+
+        raise NotImplementedError
+
+    def ensure_connected(self):
+        """
+        Connects publisher if connection isn't alive.
+        """
+
+        if not self.is_connected:
+            self.connect()
+
+    def acquire(self):
+        """
+        Connects publisher on acquire. Persistent publisher is reconnected if
+        connection was lost. Publisher might be shared, so every acquire must
+        be followed by :func:`release`.
+        """
+
+        if self.persistent or not self._acquired:
+            self.ensure_connected()
+        self._acquired += 1
+
+    def release(self):
+        """
+        Disconnects non-persistent publisher when the last acquirer released
+        it.
+        """
+
+        self._acquired -= 1
+        if not self._acquired and not self.persistent:
+            self.disconnect()
+
     def publish_message(self, message, channel=None, *args, **kwargs):
         """
         Publish message abstract method.
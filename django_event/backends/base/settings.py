@@ -12,4 +12,6 @@ from django_event import settings
 
 HOST = settings.BACKEND_OPTIONS.get('HOST', 'localhost')
 PORT = settings.BACKEND_OPTIONS.get('PORT')
-PASSWORD = settings.BACKEND_OPTIONS.get('PASSWORD', '')
\ No newline at end of file
+PASSWORD = settings.BACKEND_OPTIONS.get('PASSWORD', '')
+PERSISTENT_CONNECTION = settings.BACKEND_OPTIONS.get('PERSISTENT_CONNECTION',
+                                                     True)
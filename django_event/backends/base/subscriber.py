@@ -7,6 +7,7 @@ Backend base publisher module.
 from __future__ import unicode_literals
 
 from django_event.utils import import_var
+from django_event.subscriber.envelope import Envelope
 from django_event.subscriber.listeners import Listener
 
 
@@ -20,6 +21,10 @@ class BaseSubscriber(object):
         super(BaseSubscriber, self).__init__(*args, **kwargs)
 
         self.event_listeners = set()
+        self.unrouted_listeners = set()
+        self.routed_listeners = set()
+        self.routing_strategies = set()
+        self.routing_index = {}
 
     @staticmethod
     def _import_listener(listener):
@@ -62,36 +67,80 @@ class BaseSubscriber(object):
 
         # listener is string representation
         if isinstance(listener, str):
-            self.event_listeners.add(
+            self._add_listener(
                 self._import_listener(listener)(*args, **kwargs)
             )
 
-        # subclass of base listener
-        elif issubclass(listener, Listener):
-            self.event_listeners.add(listener(*args, **kwargs))
-
         # listener instance
         elif isinstance(listener, Listener):
-            self.event_listeners.add(listener)
+            self._add_listener(listener)
+
+        # subclass of base listener
+        elif issubclass(listener, Listener):
+            self._add_listener(listener(*args, **kwargs))
 
         else:
             raise TypeError('Wrong listener type')
 
+    def _add_listener(self, listener):
+        self.event_listeners.add(listener)
+        if listener.routed:
+            self.routed_listeners.add(listener)
+            for routing_strategy in self.routing_strategies:
+                self._index_listener(listener, routing_strategy)
+        else:
+            self.unrouted_listeners.add(listener)
+
+    def _index_listener(self, listener, routing_strategy):
+        routing_key = listener.get_routing_key(routing_strategy)
+        if routing_key is not None:
+            self.routing_index.setdefault(
+                (routing_strategy, routing_key), set()
+            ).add(listener)
+
+    def _unindex_listener(self, listener):
+        for routing_strategy in self.routing_strategies:
+            routing = (routing_strategy,
+                       listener.get_routing_key(routing_strategy))
+            listeners = self.routing_index.get(routing)
+            if listeners is not None:
+                listeners.discard(listener)
+                if not listeners:
+                    del self.routing_index[routing]
+
+    def discard_event_listener(self, listener):
+        """
+        Removes exactly given listener instance if present. Unlike
+        :func:`remove_event_listener` doesn't compare listeners by equality.
+
+        :param listener: Message listener
+        :type listener: :class:`Listener` instance
+        """
+
+        if listener not in self.event_listeners:
+            return
+        self.event_listeners.remove(listener)
+        if listener in self.routed_listeners:
+            self.routed_listeners.remove(listener)
+            self._unindex_listener(listener)
+        else:
+            self.unrouted_listeners.discard(listener)
+
     def _remove_base_listener_instance(self, listener):
         for listener_in in self.event_listeners:
             if listener_in == listener:
-                return self.event_listeners.remove(listener_in)
+                return self.discard_event_listener(listener_in)
 
     def _remove_base_listener_subclass(self, listener):
         for listener_in in self.event_listeners:
             if isinstance(listener_in, listener):
-                return self.event_listeners.remove(listener_in)
+                return self.discard_event_listener(listener_in)
 
     def _remove_string_repr_listener(self, listener):
         listener = listener.split('.').pop()
         for listener_in in self.event_listeners:
             if listener == listener_in.__class__.__name__:
-                return self.event_listeners.remove(listener_in)
+                return self.discard_event_listener(listener_in)
 
     def remove_event_listener(self, listener):
         """
@@ -107,20 +156,66 @@ class BaseSubscriber(object):
 
         if isinstance(listener, Listener):
             self._remove_base_listener_instance(listener)
-        elif issubclass(listener, Listener):
-            self._remove_base_listener_subclass(listener)
         elif isinstance(listener, str):
             self._remove_string_repr_listener(listener)
+        elif issubclass(listener, Listener):
+            self._remove_base_listener_subclass(listener)
         else:
             raise TypeError('Wrong listener type')
 
+    def index_routing_strategy(self, routing_strategy):
+        """
+        Adds routing strategy into routing index. Routing keys of all routed
+        listeners are computed once, listeners added later are indexed on
+        adding.
+
+        :param routing_strategy: Routing strategy.
+        :type routing_strategy: :class:`str`
+        """
+
+        if routing_strategy in self.routing_strategies:
+            return
+        self.routing_strategies.add(routing_strategy)
+        for listener in self.routed_listeners:
+            self._index_listener(listener, routing_strategy)
+
+    def get_routed_listeners(self, envelope):
+        """
+        Looks up routed listeners matched message routing.
+
+        :param envelope: Consumed message.
+        :type envelope: :class:`Envelope`
+
+        :return: Matched listeners.
+        :rtype: iterable of :class:`Listener`
+        """
+
+        routing_strategy = envelope.routing_strategy
+        if routing_strategy is None:
+            return ()
+        # Empty strategy means message for all subscribed clients.
+        if not routing_strategy:
+            return self.routed_listeners
+
+        self.index_routing_strategy(routing_strategy)
+        return self.routing_index.get(
+            (routing_strategy, envelope.routing_key), ()
+        )
+
     def notify_listeners(self, message):
         """
-        Notifies all listeners about consumed message.
+        Notifies listeners about consumed message. Listeners receive the
+        same :class:`Envelope` so message is decoded only once. Routed
+        listeners are notified only if message routing matched.
 
         :param message: Consumed message's body.
         :type message: :class:`str`
         """
 
-        for listener in self.event_listeners:
-            listener.on_message(message)
+        envelope = Envelope(message)
+
+        # Listeners might be removed while notifying, so iterate over copies.
+        listeners = tuple(self.unrouted_listeners)
+        listeners += tuple(self.get_routed_listeners(envelope))
+        for listener in listeners:
+            listener.on_message(envelope)
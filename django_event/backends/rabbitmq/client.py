@@ -28,7 +28,8 @@ class RabbitMQClient(BaseClient):
                  username=settings.USERNAME,
                  password=settings.PASSWORD,
                  exchange_name='direct',
-                 exchange_type='direct'):
+                 exchange_type='direct',
+                 declare_exchange=settings.DECLARE_EXCHANGE):
         """
         Initialize RabbitMQ client with passed configuration or get parameters
         from django settings module.
@@ -53,6 +54,10 @@ class RabbitMQClient(BaseClient):
 
         :param exchange_type: Exchange type, see RabbitMQ docs for more info.
         :type exchange_type: :class:`str`
+
+        :param declare_exchange: Declare exchange on channel open. Pass False
+         if exchange is provisioned out of band.
+        :type declare_exchange: :class:`bool`
         """
 
         self.host = host
@@ -62,6 +67,10 @@ class RabbitMQClient(BaseClient):
         self.password = password
         self.exchange_name = exchange_name
         self.exchange_type = exchange_type
+        self.declare_exchange = declare_exchange
+
+        # Exchanges declared on current connection.
+        self.declared_exchanges = set()
 
         self.connected = False
         self.connecting = False
@@ -130,12 +139,14 @@ class RabbitMQClient(BaseClient):
 
         self.connected = True
         self.connection = connection
+        self.declared_exchanges = set()
         self.connection.channel(self.on_channel_open)
 
     def on_channel_open(self, channel, callback=lambda frame: None):
         """
-        Callback on channel open. It will declare exchanges for messaging. See
-        RabbitMQ docs for more information.
+        Callback on channel open. It will declare exchanges for messaging if
+        they aren't declared on current connection yet. See RabbitMQ docs for
+        more information.
 
         :param channel: Opened channel.
         :type channel: :class:`Channel`
@@ -145,11 +156,32 @@ class RabbitMQClient(BaseClient):
         """
 
         self.channel = channel
+        if not self.exchange_declaration_needed():
+            callback(None)
+            return
+
+        def on_exchange_declared(frame):
+            self.declared_exchanges.add(self.exchange_name)
+            callback(frame)
+
         self.channel.exchange_declare(exchange=self.exchange_name,
                                       type=self.exchange_type,
                                       auto_delete=False,
                                       durable=True,
-                                      callback=callback)
+                                      callback=on_exchange_declared)
+
+    def exchange_declaration_needed(self):
+        """
+        Checks if exchange should be declared on current connection.
+
+        :return: True if declaration needed.
+        :rtype: :class:`bool`
+        """
+
+        return (
+            self.declare_exchange and
+            self.exchange_name not in self.declared_exchanges
+        )
 
     def on_close(self, connection, *args, **kwargs):
         """
@@ -10,8 +10,10 @@ django.
 from __future__ import unicode_literals
 
 import json
+import socket
 
 from pika import BasicProperties
+from pika import exceptions
 from pika import ConnectionParameters
 from pika import PlainCredentials
 from pika.adapters import BlockingConnection
@@ -59,6 +61,20 @@ class BlockingPublisher(Publisher):
     Synchronous publisher class. Use it with django.
     """
 
+    @property
+    def is_connected(self):
+        """
+        Checks if connection and channel are open.
+
+        :return: True if connected.
+        :rtype: :class:`bool`
+        """
+
+        return (
+            self.connection is not None and self.connection.is_open and
+            self.channel is not None and self.channel.is_open
+        )
+
     def connect(self):
         """
         Synchronous connection. Connects to RabbitMQ server and establish
@@ -66,7 +82,7 @@ class BlockingPublisher(Publisher):
         callback which will try to reconnect if this function failed.
         """
 
-        if self.connecting and not self.reconnecting:
+        if self.is_connected:
             return
 
         self.connecting = True
@@ -92,20 +108,70 @@ class BlockingPublisher(Publisher):
         if not self.connection:
             self.reconnecting = True
             self.reconnect()
+        self.connected = True
+        self.declared_exchanges = set()
         channel = self.connection.channel()
         self.on_channel_open(channel)
 
     def on_channel_open(self, channel):
         """
-        Callback on channel open. It will declare exchanges for messaging. See
-        RabbitMQ docs for more information.
+        Callback on channel open. It will declare exchanges for messaging if
+        they aren't declared on current connection yet. See RabbitMQ docs for
+        more information.
 
         :param channel: Opened channel.
         :return: :class:`BlockingChannel`
         """
 
         self.channel = channel
+        if not self.exchange_declaration_needed():
+            return
+
         self.channel.exchange_declare(exchange=self.exchange_name,
                                       type=self.exchange_type,
                                       auto_delete=False,
                                       durable=True)
+        self.declared_exchanges.add(self.exchange_name)
+
+    def publish_message(self, message, channel='', *args, **kwargs):
+        """
+        Sends given message with specified content type and routing key.
+        Persistent publisher reconnects and sends message once again if
+        connection was lost.
+
+        :param message: Message.
+        :type message: serializable object
+
+        :param channel: Routing key, see RabbitMQ docs for more info.
+        :type channel: :class:`str`
+        """
+
+        try:
+            super(BlockingPublisher, self).publish_message(
+                message, channel, *args, **kwargs)
+        except (exceptions.AMQPError, socket.error):
+            if not self.persistent:
+                raise
+            self.disconnect()
+            self.connect()
+            super(BlockingPublisher, self).publish_message(
+                message, channel, *args, **kwargs)
+
+    def disconnect(self):
+        """
+        Disconnect method. Resets connection state so publisher could be
+        connected again.
+        """
+
+        if self.connection is not None and self.connection.is_open:
+            try:
+                self.connection.close()
+            except (exceptions.AMQPError, socket.error):
+                pass
+
+        self.connected = False
+        self.connecting = False
+        self.reconnecting = False
+        self.closing = False
+        self.connection = None
+        self.channel = None
@@ -12,4 +12,5 @@ from django_event.backends.base.settings import *
 HOST = HOST or 5672
 VIRTUAL_HOST = settings.BACKEND_OPTIONS.get('VIRTUAL_HOST', '')
 USERNAME = settings.BACKEND_OPTIONS.get('USERNAME', '')
-QUEUE_NAME = settings.BACKEND_OPTIONS.get('QUEUE_NAME', 'default')
\ No newline at end of file
+QUEUE_NAME = settings.BACKEND_OPTIONS.get('QUEUE_NAME', 'default')
+DECLARE_EXCHANGE = settings.BACKEND_OPTIONS.get('DECLARE_EXCHANGE', True)
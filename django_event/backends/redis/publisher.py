@@ -25,6 +25,34 @@ class BlockingPublisher(BasePublisher, RedisClient):
     Synchronous publisher class. Use it with django.
     """
 
+    @property
+    def is_connected(self):
+        """
+        Checks if client is created. Redis client reconnects lost connections
+        by itself.
+
+        :return: True if connected.
+        :rtype: :class:`bool`
+        """
+
+        return self.client is not None
+
+    def connect(self):
+        """
+        Connects to Redis server if client isn't created yet.
+        """
+
+        if not self.is_connected:
+            super(BlockingPublisher, self).connect()
+
+    def disconnect(self):
+        """
+        Drops client so it's created again on next connect.
+        """
+
+        self.client = None
+        self.pub_sub_client = None
+
     def publish_message(self, message, channel=None, *args, **kwargs):
         """
         Sends given message with routing key.
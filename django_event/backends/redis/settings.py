@@ -14,4 +14,6 @@ DB = settings.BACKEND_OPTIONS.get('DB', 0)
 USE_REDIS_CACHE = settings.BACKEND_OPTIONS.get('USE_REDIS_CACHE', False)
 SOCKET_TIMEOUT = settings.BACKEND_OPTIONS.get('SOCKET_TIMEOUT')
 SOCKET_CONNECT_TIMEOUT = settings.BACKEND_OPTIONS.get('SOCKET_CONNECT_TIMEOUT')
-UNIX_SOCKET_PATH = settings.BACKEND_OPTIONS.get('UNIX_SOCKET_PATH')
\ No newline at end of file
+UNIX_SOCKET_PATH = settings.BACKEND_OPTIONS.get('UNIX_SOCKET_PATH')
+CONSUME_MODE = settings.BACKEND_OPTIONS.get('CONSUME_MODE', 'push')
+POLL_INTERVAL = settings.BACKEND_OPTIONS.get('POLL_INTERVAL', 0.01)
@@ -9,29 +9,53 @@ Contains asynchronous publisher for tornado.
 from __future__ import unicode_literals
 
 import time
+from redis import exceptions
 from tornado.ioloop import IOLoop
 
 from django_event.backends.base.subscriber import BaseSubscriber
+from django_event.backends.redis import settings
 from django_event.backends.redis.client import RedisClient
 
 
 class Subscriber(BaseSubscriber, RedisClient):
     """
     Base subscriber class. Asynchronous by default.
+
+    In ``push`` consume mode pub/sub socket is registered in the IOLoop and
+    messages are read only when socket becomes readable. ``poll`` mode checks
+    for new messages every ``POLL_INTERVAL`` seconds.
     """
 
-    def __init__(self, channel='', *args, **kwargs):
+    PUSH = 'push'
+    POLL = 'poll'
+
+    RECONNECT_INTERVAL = 5
+
+    def __init__(self,
+                 channel='',
+                 consume_mode=settings.CONSUME_MODE,
+                 poll_interval=settings.POLL_INTERVAL,
+                 *args, **kwargs):
         """
         Initialize subscriber.
 
         :param channel: Redis channel.
         :type channel: :class:`str`
+
+        :param consume_mode: ``push`` or ``poll``.
+        :type consume_mode: :class:`str`
+
+        :param poll_interval: Poll interval in seconds for ``poll`` mode.
+        :type poll_interval: :class:`float`
         """
 
         super(Subscriber, self).__init__(*args, **kwargs)
 
         self.channel = channel
+        self.consume_mode = consume_mode
+        self.poll_interval = poll_interval
         self._consume = True
+        self._fd = None
         self.io_loop = IOLoop.current()
 
     def consume(self):
@@ -43,7 +67,83 @@ class Subscriber(BaseSubscriber, RedisClient):
         if message:
             self.notify_listeners(message['data'])
         if self._consume:
-            self.io_loop.add_timeout(time.time() + 0.01, self.consume)
+            self.io_loop.add_timeout(time.time() + self.poll_interval,
+                                     self.consume)
+
+    def drain(self):
+        """
+        Reads all buffered messages and notifies event listeners.
+        """
+
+        connection = self.pub_sub_client.connection
+        while self._consume and connection.can_read():
+            message = self.pub_sub_client.get_message()
+            if message:
+                self.notify_listeners(message['data'])
+
+    def on_readable(self, fd, events):
+        """
+        IOLoop handler. Called internally when pub/sub socket is readable.
+
+        :param fd: Pub/sub socket file descriptor.
+        :type fd: :class:`int`
+
+        :param events: IOLoop events.
+        :type events: :class:`int`
+        """
+
+        try:
+            self.drain()
+        except exceptions.ConnectionError:
+            self.remove_handler()
+            self.io_loop.add_timeout(time.time() + self.RECONNECT_INTERVAL,
+                                     self.resubscribe)
+            return
+
+        # Redis client reconnects and resubscribes by itself on connection
+        # error, so the socket might have changed.
+        if self._consume:
+            self.add_handler()
+
+    def resubscribe(self):
+        """
+        Reconnects pub/sub connection. Redis client resubscribes channel on
+        connect. Basically you don't need to call this method manually.
+        """
+
+        if not self._consume:
+            return
+
+        try:
+            self.pub_sub_client.connection.connect()
+        except exceptions.ConnectionError:
+            self.io_loop.add_timeout(time.time() + self.RECONNECT_INTERVAL,
+                                     self.resubscribe)
+            return
+
+        self.add_handler()
+        self.drain()
+
+    def add_handler(self):
+        """
+        Registers current pub/sub socket in the IOLoop.
+        """
+
+        fd = self.pub_sub_client.connection._sock.fileno()
+        if fd == self._fd:
+            return
+        self.remove_handler()
+        self._fd = fd
+        self.io_loop.add_handler(fd, self.on_readable, IOLoop.READ)
+
+    def remove_handler(self):
+        """
+        Removes pub/sub socket from the IOLoop.
+        """
+
+        if self._fd is not None:
+            self.io_loop.remove_handler(self._fd)
+            self._fd = None
 
     def connect(self):
         """
@@ -53,11 +153,20 @@ class Subscriber(BaseSubscriber, RedisClient):
 
         super(Subscriber, self).connect()
         self.pub_sub_client.subscribe(self.channel)
-        self.consume()
+        if self.consume_mode == self.PUSH:
+            self.add_handler()
+            # Messages might be already buffered after subscribe.
+            self.drain()
+        else:
+            self.consume()
 
     def disconnect(self):
         """
-        Sets consume flag to false to stop consuming messages.
+        Sets consume flag to false to stop consuming messages. Unregisters
+        pub/sub socket and closes it in ``push`` mode.
         """
 
         self._consume = False
+        if self.consume_mode == self.PUSH:
+            self.remove_handler()
+            self.pub_sub_client.close()
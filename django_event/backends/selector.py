@@ -6,6 +6,8 @@
 
 from __future__ import unicode_literals
 
+import threading
+
 from django.conf import ImproperlyConfigured
 from django.utils.functional import cached_property
 
@@ -22,6 +24,9 @@ class BackendSelector(object):
         REDIS,
     )
 
+    def __init__(self):
+        self._local = threading.local()
+
     @classmethod
     @property
     def valid_backend_setting(cls):
@@ -96,4 +101,28 @@ class BackendSelector(object):
         :return: Subscriber class.
         """
 
-        return self.backends[2]
\ No newline at end of file
+        return self.backends[2]
+
+    def get_blocking_publisher(self):
+        """
+
+        Returns blocking publisher instance shared by current thread.
+        Publisher is created on first call.
+
+        :return: BlockingPublisher instance.
+        """
+
+        publisher = getattr(self._local, 'blocking_publisher', None)
+        if publisher is None:
+            publisher = self.blocking_publisher()
+            self._local.blocking_publisher = publisher
+        return publisher
+
+    def reset_blocking_publisher(self):
+        """
+
+        Forgets blocking publishers created before. Use it in forked process,
+        connections inherited from parent process can't be shared.
+        """
+
+        self._local = threading.local()
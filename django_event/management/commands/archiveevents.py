@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import time
+from optparse import make_option
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from django_event import settings
+from django_event.archive import ArchiveError
+from django_event.archive import EventArchive
+from django_event.models import get_event_model
+
+
+class Command(BaseCommand):
+    """
+    Django command to archive old events into compressed files and delete
+    them.
+    """
+
+    option_list = BaseCommand.option_list + (
+        make_option('--directory', dest='directory',
+                    default=settings.ARCHIVE_DIR,
+                    help='Archive directory, ARCHIVE_DIR by default.'),
+        make_option('--batch-size', type='int', dest='batch_size',
+                    default=settings.DELETE_BATCH_SIZE,
+                    help='Events archived and deleted per batch.'),
+        make_option('--sleep', type='float', dest='sleep', default=0,
+                    help='Pause between batches in seconds.'),
+        make_option('--time-budget', type='float', dest='time_budget',
+                    default=None,
+                    help='Stop archiving after given amount of seconds.'),
+    )
+
+    def handle(self, *args, **options):
+        if not options['directory']:
+            raise CommandError('Pass --directory or set ARCHIVE_DIR')
+
+        verbosity = int(options.get('verbosity', 1))
+        started_at = time.time()
+        archived = 0
+
+        archive = EventArchive(options['directory'])
+        batches = archive.archive(
+            get_event_model().objects.viewed().old(),
+            batch_size=options['batch_size'],
+            sleep=options['sleep'],
+            time_budget=options['time_budget'],
+        )
+        try:
+            for count in batches:
+                archived += count
+                if verbosity > 0:
+                    self.stdout.write(
+                        'Archived %s events (%s total, %.1fs)' % (
+                            count, archived, time.time() - started_at
+                        )
+                    )
+        except ArchiveError as e:
+            raise CommandError(str(e))
+
+        if verbosity > 0:
+            self.stdout.write('Archived %s old events in %.1fs' % (
+                archived, time.time() - started_at
+            ))
@@ -2,15 +2,49 @@
 
 from __future__ import unicode_literals
 
-from django.core.management.base import NoArgsCommand
+import time
+from optparse import make_option
 
+from django.core.management.base import BaseCommand
+
+from django_event import settings
 from django_event.models import Event
 
 
-class Command(NoArgsCommand):
+class Command(BaseCommand):
     """
-    Django command to delete old events.
+    Django command to delete old events by chunks.
     """
 
-    def handle_noargs(self, **options):
-        Event.delete_old()
+    option_list = BaseCommand.option_list + (
+        make_option('--batch-size', type='int', dest='batch_size',
+                    default=settings.DELETE_BATCH_SIZE,
+                    help='Events deleted per single DELETE statement.'),
+        make_option('--sleep', type='float', dest='sleep', default=0,
+                    help='Pause between batches in seconds.'),
+        make_option('--time-budget', type='float', dest='time_budget',
+                    default=None,
+                    help='Stop deleting after given amount of seconds.'),
+    )
+
+    def handle(self, *args, **options):
+        verbosity = int(options.get('verbosity', 1))
+        started_at = time.time()
+        deleted = 0
+
+        batches = Event.objects.viewed().old().delete_in_batches(
+            batch_size=options['batch_size'],
+            sleep=options['sleep'],
+            time_budget=options['time_budget'],
+        )
+        for count in batches:
+            deleted += count
+            if verbosity > 0:
+                self.stdout.write('Deleted %s events (%s total, %.1fs)' % (
+                    count, deleted, time.time() - started_at
+                ))
+
+        if verbosity > 0:
+            self.stdout.write('Deleted %s old events in %.1fs' % (
+                deleted, time.time() - started_at
+            ))
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+from optparse import make_option
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from django_event import partitioning
+from django_event import settings
+from django_event.models import get_event_model
+
+
+class Command(BaseCommand):
+    """
+    Django command to maintain partitioned event table. Creates future
+    partitions and drops expired ones, run it daily.
+    """
+
+    option_list = BaseCommand.option_list + (
+        make_option('--ahead', type='int', dest='ahead',
+                    default=settings.PARTITIONS_AHEAD,
+                    help='Future partitions to create.'),
+        make_option('--keep', action='store_true', dest='keep',
+                    default=False,
+                    help='Do not drop expired partitions.'),
+        make_option('--database', dest='database', default=DEFAULT_DB_ALIAS,
+                    help='Database to maintain.'),
+    )
+
+    def handle(self, *args, **options):
+        model = get_event_model()
+        using = options['database']
+        verbosity = int(options.get('verbosity', 1))
+
+        if not partitioning.is_partitioned(model, using):
+            raise CommandError('Event table is not partitioned, set '
+                               'PARTITIONING and migrate django_event')
+
+        try:
+            created = partitioning.create_partitions(
+                model, ahead=options['ahead'], using=using
+            )
+            dropped = []
+            if not options['keep']:
+                dropped = partitioning.drop_expired_partitions(
+                    model, using=using
+                )
+        except partitioning.PartitioningError as e:
+            raise CommandError(str(e))
+
+        if verbosity > 0:
+            for name in created:
+                self.stdout.write('Created partition %s' % name)
+            for name in dropped:
+                self.stdout.write('Dropped partition %s' % name)
@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+from django.core.management.base import NoArgsCommand
+
+from django_event.models import EventCounter
+
+
+class Command(NoArgsCommand):
+    """
+    Django command to recompute not viewed event counters.
+    """
+
+    def handle_noargs(self, **options):
+        repaired = EventCounter.objects.reconcile()
+        if int(options.get('verbosity', 1)) > 0:
+            self.stdout.write('Repaired %s event counters' % repaired)
@@ -2,26 +2,286 @@
 
 from __future__ import unicode_literals
 
+import errno
+import logging
+import os
+import random
+import signal
+import sys
+from optparse import make_option
+
+from django import db
 from django.core.management.base import BaseCommand
 from sockjs.tornado import SockJSRouter
-from tornado.web import Application
+from tornado import process
+from tornado.httpserver import HTTPServer
 from tornado.ioloop import IOLoop
+from tornado.ioloop import PeriodicCallback
+from tornado.netutil import bind_sockets
+from tornado.web import Application
 
 from django_event.management.commands import settings
+from django_event.subscriber.auth import authenticator
 from django_event.subscriber.connection import EventConnection
+from django_event.subscriber.drain import drainer
+from django_event.subscriber.hub import hub
+from django_event.subscriber.outbound import stats as outbound_stats
+
+
+logger = logging.getLogger(__name__)
 
 
 class Command(BaseCommand):
     """
     Django command to start tornado server.
+
+    On SIGTERM server stops accepting connections, asks connected clients to
+    reconnect with random delay, closes connections gradually over drain
+    window and exits. In multi-process mode the signal received by parent
+    process is forwarded to its workers and crashed workers aren't restarted
+    anymore.
     """
 
+    option_list = BaseCommand.option_list + (
+        make_option('--processes', type='int', dest='processes',
+                    default=settings.PROCESSES,
+                    help='Worker processes sharing listening socket, '
+                         '0 means one per CPU.'),
+        make_option('--max-restarts', type='int', dest='max_restarts',
+                    default=settings.MAX_RESTARTS,
+                    help='Max restarts of crashed worker processes.'),
+        make_option('--metrics-interval', type='float',
+                    dest='metrics_interval',
+                    default=settings.METRICS_INTERVAL,
+                    help='Worker metrics logging interval in seconds, '
+                         '0 disables metrics.'),
+        make_option('--drain-window', type='float', dest='drain_window',
+                    default=settings.DRAIN_WINDOW,
+                    help='Seconds to close connections over on SIGTERM.'),
+        make_option('--reconnect-delay', type='float',
+                    dest='reconnect_delay',
+                    default=settings.RECONNECT_DELAY,
+                    help='Max random reconnect delay sent to clients on '
+                         'SIGTERM.'),
+    )
+
+    forwarded_signal = False
+    parent_pid = None
+    worker_id = None
+
     def handle(self, *args, **options):
-        router = SockJSRouter(EventConnection, settings.HOST)
-        app = Application(router.urls)
-        app.listen(settings.PORT)
+        processes = options['processes']
+        self.drain_window = options['drain_window']
+        self.reconnect_delay = options['reconnect_delay']
+
+        if processes == 1:
+            router = self.get_router()
+            self.server = HTTPServer(Application(router.urls))
+            self.server.listen(settings.PORT)
+        else:
+            # Workers share listening sockets bound before fork. IOLoop and
+            # database connections must not be shared, so they are created
+            # in workers only.
+            sockets = bind_sockets(settings.PORT)
+            for connection in db.connections.all():
+                connection.close()
+            self.workers = {}
+            self.parent_pid = os.getpid()
+            signal.signal(signal.SIGTERM, self.forward_signal)
+            self.fork_workers(processes, options['max_restarts'])
+            router = self.get_router()
+            self.server = HTTPServer(Application(router.urls))
+            self.server.add_sockets(sockets)
+
+        signal.signal(signal.SIGTERM, self.on_drain_signal)
+
+        if options['metrics_interval'] > 0:
+            PeriodicCallback(
+                lambda: self.log_metrics(router),
+                options['metrics_interval'] * 1000
+            ).start()
 
         try:
             IOLoop.instance().start()
         except KeyboardInterrupt:
-            pass
\ No newline at end of file
+            pass
+
+    def get_router(self):
+        """
+        Creates SockJS router.
+
+        :return: Router.
+        :rtype: :class:`SockJSRouter`
+        """
+
+        return SockJSRouter(EventConnection, settings.HOST)
+
+    def fork_workers(self, processes, max_restarts):
+        """
+        Forks worker processes and restarts crashed ones like
+        :func:`tornado.process.fork_processes`, but keeps worker pids, so
+        parent process signals its workers only. Returns in workers only,
+        parent process exits when all workers exited. On ^C or too many
+        restarts parent process stops restarting workers, drains them and
+        waits for them to exit.
+
+        Only crashed workers are restarted. Rolling restart of running
+        workers isn't supported, forked workers can't load new code, so
+        restart the whole server with SIGTERM to deploy.
+
+        :param processes: Worker processes count, 0 means one per CPU.
+        :type processes: :class:`int`
+
+        :param max_restarts: Max restarts of crashed worker processes.
+        :type max_restarts: :class:`int`
+        """
+
+        if processes <= 0:
+            processes = process.cpu_count()
+        logger.info('Starting %s processes', processes)
+
+        for worker_id in range(processes):
+            if self.start_worker(worker_id):
+                return
+
+        restarts = 0
+        gave_up = False
+        while self.workers:
+            try:
+                pid, status = os.wait()
+            except OSError as e:
+                if e.errno == errno.EINTR:
+                    continue
+                raise
+            except KeyboardInterrupt:
+                # Workers got SIGINT too if it came from terminal, otherwise
+                # they are drained.
+                signal.signal(signal.SIGINT, signal.SIG_IGN)
+                self.forward_signal(signal.SIGTERM, None)
+                continue
+            if pid not in self.workers:
+                continue
+            worker_id = self.workers.pop(pid)
+            if os.WIFSIGNALED(status):
+                logger.warning('Worker %s (pid %s) killed by signal %s',
+                               worker_id, pid, os.WTERMSIG(status))
+            elif os.WEXITSTATUS(status) != 0:
+                logger.warning('Worker %s (pid %s) exited with status %s',
+                               worker_id, pid, os.WEXITSTATUS(status))
+            else:
+                logger.info('Worker %s (pid %s) exited normally',
+                            worker_id, pid)
+                continue
+            if self.forwarded_signal:
+                continue
+            restarts += 1
+            if restarts > max_restarts:
+                # Remaining workers would keep serving shared socket after
+                # parent exit, so they are drained and reaped first.
+                logger.error('Too many worker restarts, stopping workers')
+                gave_up = True
+                self.forward_signal(signal.SIGTERM, None)
+                continue
+            if self.start_worker(worker_id):
+                return
+        if gave_up:
+            raise RuntimeError('Too many worker restarts, giving up')
+        sys.exit(0)
+
+    def start_worker(self, worker_id):
+        """
+        Forks worker process.
+
+        :param worker_id: Worker number.
+        :type worker_id: :class:`int`
+
+        :return: True in worker process, False in parent process.
+        :rtype: :class:`bool`
+        """
+
+        pid = os.fork()
+        if pid == 0:
+            self.worker_id = worker_id
+            self.workers = {}
+            # Drain is scheduled even if server isn't started yet.
+            signal.signal(signal.SIGTERM, self.on_drain_signal)
+            # Drain order and reconnect delays must differ between workers.
+            random.seed()
+            return True
+        self.workers[pid] = worker_id
+        return False
+
+    def forward_signal(self, signum, frame):
+        """
+        Parent process signal handler. Forwards signal to workers, so they
+        start draining.
+
+        :param signum: Signal number.
+        :type signum: :class:`int`
+
+        :param frame: Current stack frame.
+        :type frame: :class:`frame`
+        """
+
+        # Worker forked but not yet set its own handler.
+        if os.getpid() != self.parent_pid:
+            self.on_drain_signal(signum, frame)
+            return
+        self.forwarded_signal = True
+        logger.info('Received signal %s, forwarding to workers', signum)
+        for pid in list(self.workers):
+            try:
+                os.kill(pid, signum)
+            except OSError as e:
+                if e.errno != errno.ESRCH:
+                    raise
+
+    def on_drain_signal(self, signum, frame):
+        """
+        Worker signal handler. Schedules draining on IOLoop.
+
+        :param signum: Signal number.
+        :type signum: :class:`int`
+
+        :param frame: Current stack frame.
+        :type frame: :class:`frame`
+        """
+
+        IOLoop.instance().add_callback_from_signal(self.drain)
+
+    def drain(self):
+        """
+        Stops accepting connections, closes open connections gradually and
+        stops IOLoop when drain window is over.
+        """
+
+        if drainer.draining:
+            return
+        logger.info('Draining %s connections over %s seconds',
+                    len(drainer.connections), self.drain_window)
+        self.server.stop()
+        drainer.drain(self.drain_window, self.reconnect_delay,
+                      IOLoop.instance().stop)
+
+    def log_metrics(self, router):
+        """
+        Logs worker metrics.
+
+        :param router: Worker SockJS router.
+        :type router: :class:`SockJSRouter`
+        """
+
+        stats = router.stats.dump()
+        logger.info(
+            'worker=%s pid=%s sessions=%s connections=%s '
+            'packets_sent_ps=%s packets_recv_ps=%s channels=%s '
+            'auth_pending=%s auth_cached=%s '
+            'frames_dropped=%s frames_coalesced=%s slow_consumers=%s',
+            self.worker_id, os.getpid(),
+            stats['sessions_active'], stats['connections_active'],
+            stats['packets_sent_ps'], stats['packets_recv_ps'],
+            len(hub.subscribers),
+            len(authenticator.pending), len(authenticator.cache),
+            outbound_stats.dropped, outbound_stats.coalesced,
+            outbound_stats.disconnected,
+        )
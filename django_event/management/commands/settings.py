@@ -11,4 +11,16 @@ from django_event import settings
 
 
 HOST = settings.TORNADO_OPTIONS.get('HOST', '/')
-PORT = settings.TORNADO_OPTIONS.get('PORT', 8989)
\ No newline at end of file
+PORT = settings.TORNADO_OPTIONS.get('PORT', 8989)
+
+# Worker processes sharing listening socket, 0 means one per CPU.
+PROCESSES = settings.TORNADO_OPTIONS.get('PROCESSES', 1)
+# Crashed workers are restarted until MAX_RESTARTS restarts happened.
+MAX_RESTARTS = settings.TORNADO_OPTIONS.get('MAX_RESTARTS', 100)
+# Worker metrics are logged every METRICS_INTERVAL seconds, 0 disables.
+METRICS_INTERVAL = settings.TORNADO_OPTIONS.get('METRICS_INTERVAL', 60)
+
+# Connections are closed gradually over DRAIN_WINDOW seconds on SIGTERM,
+# clients are asked to reconnect after random delay up to RECONNECT_DELAY.
+DRAIN_WINDOW = settings.TORNADO_OPTIONS.get('DRAIN_WINDOW', 30)
+RECONNECT_DELAY = settings.TORNADO_OPTIONS.get('RECONNECT_DELAY', 10)
@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_event', '0002_auto_20150519_1156'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='progress',
+            field=models.FloatField(default=0.0, verbose_name='progress'),
+            preserve_default=True,
+        ),
+    ]
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_event', '0003_event_progress'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='event',
+            options={'verbose_name': 'Event', 'verbose_name_plural': 'Events'},
+        ),
+        migrations.AlterField(
+            model_name='event',
+            name='task_id',
+            field=models.CharField(max_length=256, null=True, db_index=True),
+            preserve_default=True,
+        ),
+        migrations.AlterIndexTogether(
+            name='event',
+            index_together=set([
+                ('user', 'completed_at'),
+                ('viewed', 'completed_at'),
+                ('user', 'viewed'),
+            ]),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+from django.conf import settings
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('django_event', '0004_event_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventCounter',
+            fields=[
+                ('user', models.OneToOneField(related_name='event_counter', primary_key=True, serialize=False, to=settings.AUTH_USER_MODEL, verbose_name='user')),
+                ('not_viewed', models.IntegerField(default=0, verbose_name='not viewed events')),
+            ],
+            options={
+                'verbose_name': 'Event counter',
+                'verbose_name_plural': 'Event counters',
+            },
+            bases=(models.Model,),
+        ),
+    ]
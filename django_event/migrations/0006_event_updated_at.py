@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_event', '0005_eventcounter'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='updated_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, verbose_name='updated at', auto_now=True),
+            preserve_default=False,
+        ),
+        migrations.AlterIndexTogether(
+            name='event',
+            index_together=set([
+                ('user', 'completed_at'),
+                ('viewed', 'completed_at'),
+                ('user', 'viewed'),
+                ('user', 'updated_at'),
+            ]),
+        ),
+    ]
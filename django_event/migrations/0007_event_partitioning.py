@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+from django_event import partitioning
+from django_event import settings
+
+
+def partition_events(apps, schema_editor):
+    if (not settings.PARTITIONING or
+            settings.EVENT_MODEL != 'django_event.Event'):
+        return
+    model = apps.get_model('django_event', 'Event')
+    partitioning.partition_table(model, using=schema_editor.connection.alias)
+
+
+def unpartition_events(apps, schema_editor):
+    model = apps.get_model('django_event', 'Event')
+    if partitioning.is_partitioned(model, schema_editor.connection.alias):
+        partitioning.unpartition_table(
+            model, using=schema_editor.connection.alias
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_event', '0006_event_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_events, unpartition_events),
+    ]
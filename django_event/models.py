@@ -8,6 +8,8 @@ You must handle old events by yourself using cron or celery worker.
 
 from __future__ import unicode_literals
 
+import logging
+import time
 from datetime import timedelta
 
 import celery
@@ -15,17 +17,29 @@ from django.apps.registry import apps
 from django.conf import ImproperlyConfigured
 from django.conf import settings as app_settings
 from django.contrib.auth.models import User
+from django.db import IntegrityError
+from django.db import connections
 from django.db import models
+from django.db import transaction
+from django.db.models import Count
+from django.db.models import F
 from django.utils import timezone
 from django.utils.encoding import python_2_unicode_compatible
 from django.utils.translation import ugettext_lazy as _
 
 from django_event import settings
+from django_event.utils import get_channel
 from django_event.utils import get_routing
 from django_event.backends import Backend
 from django_event.publisher.request import EventRequest
 
 
+logger = logging.getLogger(__name__)
+
+# Viewed notifications are delivered to the events owner only.
+VIEWED_ROUTING_STRATEGY = 'user.id'
+
+
 class EventQuerySet(models.QuerySet):
     """
     Event query set and manager.
@@ -105,12 +119,142 @@ class EventQuerySet(models.QuerySet):
 
         return self.filter(completed=True, status=False)
 
-    def mark_viewed(self):
+    def mark_viewed(self, user=None):
+        """
+        Mark completed events as viewed by single update. If user is given
+        queryset must contain only his events and his not viewed counter is
+        decremented, otherwise counters of affected users are recomputed.
+
+        :param user: Owner of events.
+        :type user: :class:`User`
+
+        :return: Marked events count.
+        :rtype: :class:`int`
+        """
+
+        queryset = self.completed().not_viewed()
+        if user is not None:
+            viewed = queryset.update(viewed=True, updated_at=timezone.now())
+            if viewed:
+                EventCounter.objects.add(user.pk, -viewed)
+            return viewed
+
+        user_ids = list(
+            queryset.order_by().values_list('user', flat=True).distinct()
+        )
+        viewed = queryset.update(viewed=True, updated_at=timezone.now())
+        if viewed:
+            EventCounter.objects.reconcile(user_ids)
+        return viewed
+
+    def not_viewed_count(self, user):
         """
-        Mark completed events as viewed.
+        Cached count of user not viewed events, see :class:`EventCounter`.
+        Doesn't depend on queryset filters.
+
+        :param user: User.
+        :type user: :class:`User`
+
+        :return: Not viewed events count.
+        :rtype: :class:`int`
         """
 
-        self.completed().not_viewed().update(viewed=True)
+        return EventCounter.objects.get_not_viewed(user)
+
+    def batches(self, batch_size=None, sleep=0, time_budget=None,
+                fields=()):
+        """
+        Iterates events by primary key chunks using keyset pagination, so
+        memory usage doesn't depend on events count. Chunks may be deleted
+        by caller while iterating.
+
+        :param batch_size: Chunk size, defaults to DELETE_BATCH_SIZE setting.
+        :type batch_size: :class:`int`
+
+        :param sleep: Pause between chunks in seconds.
+        :type sleep: :class:`float`
+
+        :param time_budget: Stop after given amount of seconds, unlimited
+            if None. Chunk being processed is always finished.
+        :type time_budget: :class:`float`
+
+        :param fields: Fields to be fetched, all fields if empty.
+        :type fields: :class:`tuple`
+
+        :return: Generator of row dict lists.
+        :rtype: :class:`list`
+        """
+
+        batch_size = batch_size or settings.DELETE_BATCH_SIZE
+        pk_name = self.model._meta.pk.attname
+        if fields and pk_name not in fields:
+            fields = tuple(fields) + (pk_name, )
+        queryset = self.order_by('pk').values(*fields)
+
+        started_at = time.time()
+        last_pk = None
+        while True:
+            if last_pk is not None:
+                chunk = list(queryset.filter(pk__gt=last_pk)[:batch_size])
+            else:
+                chunk = list(queryset[:batch_size])
+            if not chunk:
+                return
+
+            yield chunk
+            last_pk = chunk[-1][pk_name]
+
+            if len(chunk) < batch_size:
+                return
+            if (time_budget is not None and
+                    time.time() - started_at >= time_budget):
+                return
+            if sleep:
+                time.sleep(sleep)
+
+    def delete_pks(self, pks):
+        """
+        Deletes events with given primary keys by a single raw ``DELETE``,
+        so model instances aren't loaded and delete signals aren't sent.
+        Queryset filters are not applied.
+
+        :param pks: Primary keys.
+        :type pks: :class:`list`
+
+        :return: Deleted rows count.
+        :rtype: :class:`int`
+        """
+
+        if not pks:
+            return 0
+
+        connection = connections[self.db]
+        cursor = connection.cursor()
+        cursor.execute(
+            'DELETE FROM %s WHERE %s IN (%s)' % (
+                connection.ops.quote_name(self.model._meta.db_table),
+                connection.ops.quote_name(self.model._meta.pk.column),
+                ', '.join(['%s'] * len(pks)),
+            ),
+            pks
+        )
+        return cursor.rowcount
+
+    def delete_in_batches(self, batch_size=None, sleep=0, time_budget=None):
+        """
+        Deletes events by primary key chunks. Every chunk is deleted by
+        :func:`delete_pks` in its own transaction.
+        See :func:`batches` for parameters.
+
+        :return: Generator of deleted rows count per chunk.
+        :rtype: :class:`int`
+        """
+
+        pk_name = self.model._meta.pk.attname
+        for chunk in self.batches(batch_size, sleep, time_budget, (pk_name, )):
+            with transaction.atomic(using=self.db):
+                deleted = self.delete_pks([row[pk_name] for row in chunk])
+            yield deleted
 
 
 @python_2_unicode_compatible
@@ -127,6 +271,15 @@ class AbstractBaseEvent(models.Model):
         verbose_name = _('Event')
         verbose_name_plural = _('Events')
         abstract = True
+        # Indexes for user event lists ordered by completion time, old
+        # events lookup, not viewed events lookup and user events state used
+        # by conditional requests.
+        index_together = (
+            ('user', 'completed_at'),
+            ('viewed', 'completed_at'),
+            ('user', 'viewed'),
+            ('user', 'updated_at'),
+        )
 
     objects = EventQuerySet.as_manager()
 
@@ -135,7 +288,7 @@ class AbstractBaseEvent(models.Model):
     type = models.CharField(max_length=30, verbose_name=_('event type'))
     send_mail = models.BooleanField(default=False, verbose_name=_('send mail'))
 
-    task_id = models.CharField(max_length=256, null=True)
+    task_id = models.CharField(max_length=256, null=True, db_index=True)
     task_name = models.CharField(max_length=256, editable=False)
     event_request = models.TextField(null=True)
 
@@ -145,6 +298,8 @@ class AbstractBaseEvent(models.Model):
                                       verbose_name=_('started at'))
     completed_at = models.DateTimeField(null=True,
                                         verbose_name=_('completed at'))
+    updated_at = models.DateTimeField(auto_now=True,
+                                      verbose_name=_('updated at'))
 
     started = models.BooleanField(default=False, verbose_name=_('started'))
     completed = models.BooleanField(default=False, verbose_name=_('completed'))
@@ -154,6 +309,7 @@ class AbstractBaseEvent(models.Model):
 
     status = models.BooleanField(default=True, verbose_name=_('status'))
     result = models.TextField(null=True, verbose_name=_('result'))
+    progress = models.FloatField(default=0.0, verbose_name=_('progress'))
 
     def __init__(self, *args, **kwargs):
         """
@@ -166,8 +322,9 @@ class AbstractBaseEvent(models.Model):
 
         super(AbstractBaseEvent, self).__init__(*args, **kwargs)
 
-        self._publisher = Backend.blocking_publisher()
-        self._progress = 0.0
+        # Deferred progress isn't loaded just for the baseline.
+        self._progress_flushed = self.__dict__.get('progress', 0.0)
+        self._progress_flushed_at = time.time()
         self._retried_id = None
         self._progress_throttling = None
         self._delta_acc = 0
@@ -220,6 +377,18 @@ class AbstractBaseEvent(models.Model):
     # SHORTCUTS
     ############################################################################
 
+    @property
+    def _publisher(self):
+        """
+        Blocking publisher shared by current thread. It's created only when
+        event is actually publishing, so read-only usage costs nothing.
+
+        :return: Blocking publisher.
+        :rtype: :class:`BlockingPublisher`
+        """
+
+        return Backend.get_blocking_publisher()
+
     @property
     def failure(self):
         """
@@ -242,6 +411,19 @@ class AbstractBaseEvent(models.Model):
 
         return not self.failure
 
+    @property
+    def channel(self):
+        """
+        Shortcut for event backend channel.
+
+        :return: Channel event messages are published to.
+        :rtype: :class:`str`
+        """
+
+        return get_channel(self.type,
+                           self._routing_strategy,
+                           self._routing_key)
+
     @property
     def may_be_retried(self):
         """
@@ -268,12 +450,59 @@ class AbstractBaseEvent(models.Model):
         )
 
     @classmethod
-    def delete_old(cls):
+    def delete_old(cls, batch_size=None, sleep=0, time_budget=None):
+        """
+        Deletes old viewed events by chunks.
+        See :func:`EventQuerySet.delete_in_batches` for parameters.
+
+        :return: Deleted events count.
+        :rtype: :class:`int`
+        """
+
+        return sum(cls.objects.viewed().old().delete_in_batches(
+            batch_size=batch_size, sleep=sleep, time_budget=time_budget
+        ))
+
+    @classmethod
+    def mark_viewed_by_user(cls, user, ids=None, up_to=None):
         """
-        Deletes old events.
+        Marks user completed events as viewed by single update and publishes
+        single notification about it.
+
+        :param user: Events owner.
+        :type user: :class:`User`
+
+        :param ids: Event ids to be marked.
+        :type ids: :class:`list`
+
+        :param up_to: Mark events with id less or equal to given one.
+        :type up_to: :class:`int`
+
+        :return: Marked events count.
+        :rtype: :class:`int`
+        """
+
+        queryset = cls.objects.filter(user=user)
+        if ids is not None:
+            queryset = queryset.filter(pk__in=ids)
+        if up_to is not None:
+            queryset = queryset.filter(pk__lte=up_to)
+
+        viewed = queryset.mark_viewed(user)
+        if viewed:
+            cls.on_viewed(user, ids, up_to)
+        return viewed
+
+    def save(self, *args, **kwargs):
+        """
+        Saves event. Not viewed counter of user is incremented when not
+        viewed event is created.
         """
 
-        cls.objects.viewed().old().delete()
+        adding = self._state.adding
+        super(AbstractBaseEvent, self).save(*args, **kwargs)
+        if adding and not self.viewed:
+            EventCounter.objects.add(self.user_id, 1)
 
     def view(self):
         """
@@ -281,7 +510,34 @@ class AbstractBaseEvent(models.Model):
         """
 
         self.viewed = True
-        self.save()
+        if self.save_fields(('viewed', ), viewed=False):
+            EventCounter.objects.add(self.user_id, -1)
+
+    def save_fields(self, fields, **conditions):
+        """
+        Writes only given fields and update time into database instead of
+        the whole row. If conditions passed row is updated only if it still
+        matches them, so concurrent state transitions are resolved by
+        database.
+
+        :param fields: Field names to be written.
+        :type fields: :class:`tuple`
+
+        :param conditions: Lookups the row must match to be updated.
+
+        :return: True if row was updated.
+        :rtype: :class:`bool`
+        """
+
+        self.updated_at = timezone.now()
+        fields = tuple(fields) + ('updated_at', )
+        if not conditions:
+            self.save(update_fields=fields)
+            return True
+
+        values = dict((field, getattr(self, field)) for field in fields)
+        queryset = self.__class__.objects.filter(pk=self.pk, **conditions)
+        return bool(queryset.update(**values))
 
     ############################################################################
     # EXECUTING METHODS
@@ -303,9 +559,9 @@ class AbstractBaseEvent(models.Model):
 
         self.started = True
         self.started_at = timezone.now()
-        self.save()
+        self.save_fields(('started', 'started_at'))
 
-        self._publisher.connect()
+        self._publisher.acquire()
         self.on_start(custom_message)
         callback(self)
 
@@ -317,7 +573,7 @@ class AbstractBaseEvent(models.Model):
                  errback=lambda event: None):
         """
         Complete event and save state into database. It will always call passed
-        callback.
+        callback unless event was already completed or canceled.
 
         :param result: Task result.
         :type result: JSON serializable object.
@@ -340,15 +596,23 @@ class AbstractBaseEvent(models.Model):
         self.completed = True
         self.status = status
         self.result = result
+        # Failed events keep the last reported progress.
+        if status:
+            self.progress = 100.0
         self.completed_at = timezone.now()
-        self.save()
+        updated = self.save_fields(
+            ('completed', 'status', 'result', 'progress', 'completed_at'),
+            completed=False, canceled=False
+        )
 
-        self.on_complete(custom_message, callback, errback)
-        self._publisher.disconnect()
+        if updated:
+            self.on_complete(custom_message, callback, errback)
+        self._publisher.release()
 
     def increment_progress(self, progress_delta, custom_message=None):
         """
-        Increments event progress with out saving to database.
+        Increments event progress. Progress is written to database at most
+        every PROGRESS_FLUSH_INTERVAL seconds or PROGRESS_FLUSH_DELTA percents.
         If custom message passed it will send it instead of default message.
 
         :param progress_delta: Progress delta.
@@ -358,10 +622,12 @@ class AbstractBaseEvent(models.Model):
         :type custom_message: JSON serializable object.
         """
 
-        if self._progress + progress_delta > 100.0:
-            self._progress = 99.9
+        if self.progress + progress_delta > 100.0:
+            self.progress = 99.9
         else:
-            self._progress += progress_delta
+            self.progress += progress_delta
+
+        self.flush_progress()
 
         # If event action perform hard work progress delta might be so low
         # to messages never be sent. Here we add simple progress delta
@@ -375,6 +641,34 @@ class AbstractBaseEvent(models.Model):
             self._delta_acc = 0
             self.on_progress_change(custom_message)
 
+    def flush_progress(self, force=False):
+        """
+        Writes progress to database if it changed enough or enough time
+        passed since last write. Only progress column is updated.
+
+        :param force: Write progress regardless of throttling.
+        :type force: :class:`bool`
+        """
+
+        if self.progress == self._progress_flushed:
+            return
+
+        now = time.time()
+        interval_passed = (
+            now - self._progress_flushed_at >= settings.PROGRESS_FLUSH_INTERVAL
+        )
+        delta_reached = (
+            abs(self.progress - self._progress_flushed) >=
+            settings.PROGRESS_FLUSH_DELTA
+        )
+        if not (force or interval_passed or delta_reached):
+            return
+
+        self.__class__.objects.filter(pk=self.pk).update(
+            progress=self.progress, updated_at=timezone.now())
+        self._progress_flushed = self.progress
+        self._progress_flushed_at = now
+
     def retry(self, custom_message=None, request=None, **kwargs):
         """
         Retry not completed event.
@@ -382,19 +676,38 @@ class AbstractBaseEvent(models.Model):
 
         :param custom_message: Custom message.
         :type custom_message: JSON serializable object.
+
+        :return: New event id or None if event was already retried.
+        :rtype: :class:`int`
+
+        :raise: Task sending errors. Event stays not retried then.
         """
 
         if not request or not kwargs:
             retry_request = EventRequest.deserialize(self.event_request)
         else:
             retry_request = EventRequest(request, **kwargs)
-        new_task_id = celery.current_app.send_task(
-            self.task_name,
-            args=(retry_request, )
-        ).id
+
+        was_viewed = self.viewed
         self.retried = True
         self.viewed = True
-        self.save()
+        if not self.save_fields(('retried', 'viewed'), retried=False):
+            return None
+        if not was_viewed:
+            EventCounter.objects.add(self.user_id, -1)
+
+        try:
+            new_task_id = celery.current_app.send_task(
+                self.task_name,
+                args=(retry_request, )
+            ).id
+        except Exception:
+            self.retried = False
+            self.viewed = was_viewed
+            self.save_fields(('retried', 'viewed'), retried=True)
+            if not was_viewed:
+                EventCounter.objects.add(self.user_id, 1)
+            raise
         self.on_retry(custom_message)
 
         self._retried_id = self.__class__.objects.get(task_id=new_task_id).id
@@ -407,18 +720,72 @@ class AbstractBaseEvent(models.Model):
 
         :param custom_message: Custom message.
         :type custom_message: JSON serializable object.
+
+        :return: True if canceled, False if event was completed or canceled
+         concurrently.
+        :rtype: :class:`bool`
         """
 
-        celery.task.control.revoke(self.task_id, terminate=True)
+        was_viewed = self.viewed
         self.canceled = True
         self.viewed = True
-        self.save()
+        if not self.save_fields(('canceled', 'viewed'),
+                                completed=False, canceled=False):
+            return False
+        if not was_viewed:
+            EventCounter.objects.add(self.user_id, -1)
+
+        celery.task.control.revoke(self.task_id, terminate=True)
         self.on_cancel(custom_message)
+        return True
 
     ############################################################################
     # CALLBACKS
     ############################################################################
 
+    @classmethod
+    def on_viewed(cls, user, ids, up_to):
+        """
+        Events viewed callback. Sends message to the user subscribed clients
+        so other opened pages could update not viewed events count.
+        Notification is best-effort: publishing errors are logged only as
+        events are already marked.
+
+        :param user: Events owner.
+        :type user: :class:`User`
+
+        :param ids: Marked event ids.
+        :type ids: :class:`list`
+
+        :param up_to: Upper bound of marked event ids.
+        :type up_to: :class:`int`
+        """
+
+        routing_key = get_routing(user, VIEWED_ROUTING_STRATEGY)
+        message = {
+            'message': {
+                'type': settings.VIEWED_EVENT_TYPE,
+                'action': 'viewed',
+                'ids': ids,
+                'up_to': up_to,
+                'not_viewed': EventCounter.objects.get_not_viewed(user),
+            },
+            'routing_strategy': VIEWED_ROUTING_STRATEGY,
+            'routing_key': routing_key
+        }
+        channel = get_channel(settings.VIEWED_EVENT_TYPE,
+                              VIEWED_ROUTING_STRATEGY, routing_key)
+
+        try:
+            publisher = Backend.get_blocking_publisher()
+            publisher.acquire()
+            try:
+                publisher.publish_message(message, channel=channel)
+            finally:
+                publisher.release()
+        except Exception:
+            logger.exception('Failed to publish viewed events of %s', user)
+
     def on_start(self, custom_message):
         """
         Start callback. Sends message to subscribed clients.
@@ -440,7 +807,7 @@ class AbstractBaseEvent(models.Model):
             },
             'routing_strategy': self._routing_strategy,
             'routing_key': self._routing_key
-        }, channel=self.type)
+        }, channel=self.channel)
 
     def on_complete(self, custom_message, callback, errback):
         """
@@ -483,7 +850,7 @@ class AbstractBaseEvent(models.Model):
             },
             'routing_strategy': self._routing_strategy,
             'routing_key': self._routing_key
-        }, channel=self.type)
+        }, channel=self.channel)
         callback(self)
 
     def on_error(self, custom_message, errback):
@@ -509,7 +876,7 @@ class AbstractBaseEvent(models.Model):
             },
             'routing_strategy': self._routing_strategy,
             'routing_key': self._routing_key
-        }, channel=self.type)
+        }, channel=self.channel)
         errback(self)
 
     def on_progress_change(self, custom_message):
@@ -525,14 +892,14 @@ class AbstractBaseEvent(models.Model):
                 self.id: {
                     'type': self.type,
                     'action': 'progress_change',
-                    'status': self._progress,
+                    'status': self.progress,
                     'body': None,
                     'error': None
                 }
             },
             'routing_strategy': self._routing_strategy,
             'routing_key': self._routing_key
-        }, channel=self.type)
+        }, channel=self.channel)
 
     def on_cancel(self, custom_message):
         """
@@ -554,7 +921,7 @@ class AbstractBaseEvent(models.Model):
             },
             'routing_strategy': self._routing_strategy,
             'routing_key': self._routing_key
-        }, channel=self.type)
+        }, channel=self.channel)
 
     def on_retry(self, custom_message):
         """
@@ -576,7 +943,7 @@ class AbstractBaseEvent(models.Model):
             },
             'routing_strategy': self._routing_strategy,
             'routing_key': self._routing_key
-        }, channel=self.type)
+        }, channel=self.channel)
 
     def try_custom(self, message):
         """
@@ -640,12 +1007,121 @@ class Event(AbstractBaseEvent):
     Default event model.
     """
 
-    class Meta:
+    class Meta(AbstractBaseEvent.Meta):
         abstract = (
             False if settings.EVENT_MODEL == 'django_event.Event' else True
         )
 
 
+class EventCounterQuerySet(models.QuerySet):
+    """
+    Event counter query set and manager.
+    """
+
+    def add(self, user_id, delta):
+        """
+        Atomically changes user counter by given delta. Missing counter is
+        computed from events.
+
+        :param user_id: User id.
+        :type user_id: :class:`int`
+
+        :param delta: Counter change.
+        :type delta: :class:`int`
+        """
+
+        if not self.filter(user_id=user_id).update(
+                not_viewed=F('not_viewed') + delta):
+            self.reconcile([user_id])
+
+    def get_not_viewed(self, user):
+        """
+        Get user not viewed events count.
+
+        :param user: User.
+        :type user: :class:`User`
+
+        :return: Not viewed events count.
+        :rtype: :class:`int`
+        """
+
+        count = self.filter(user=user).values_list(
+            'not_viewed', flat=True
+        ).first()
+        if count is None:
+            self.reconcile([user.pk])
+            count = self.filter(user=user).values_list(
+                'not_viewed', flat=True
+            ).first()
+        return max(count or 0, 0)
+
+    def reconcile(self, user_ids=None):
+        """
+        Recomputes counters from events. Only counters which drifted are
+        written.
+
+        :param user_ids: Users to reconcile, all users if None.
+        :type user_ids: :class:`list`
+
+        :return: Repaired counters count.
+        :rtype: :class:`int`
+        """
+
+        events = get_event_model().objects.not_viewed()
+        counters = self.all()
+        if user_ids is not None:
+            events = events.filter(user__in=user_ids)
+            counters = counters.filter(user__in=user_ids)
+
+        counts = dict(
+            events.order_by().values_list('user').annotate(Count('pk'))
+        )
+        current = dict(counters.values_list('user', 'not_viewed'))
+        users = set(counts) | set(current) | set(user_ids or ())
+
+        repaired = 0
+        for user_id in users:
+            count = counts.get(user_id, 0)
+            if current.get(user_id) == count:
+                continue
+            repaired += 1
+            if self.filter(user_id=user_id).update(not_viewed=count):
+                continue
+            try:
+                with transaction.atomic(using=self.db):
+                    self.create(user_id=user_id, not_viewed=count)
+            except IntegrityError:
+                self.filter(user_id=user_id).update(not_viewed=count)
+        return repaired
+
+
+@python_2_unicode_compatible
+class EventCounter(models.Model):
+    """
+    Denormalized count of user not viewed events. Maintained on event
+    creation, view, cancel, retry and :func:`EventQuerySet.mark_viewed`.
+    Bulk operations bypassing models may cause drift, repair it with
+    ``reconcileeventcounters`` command.
+    """
+
+    user = models.OneToOneField(
+        getattr(app_settings, 'AUTH_USER_MODEL', User),
+        primary_key=True, related_name='event_counter',
+        verbose_name=_('user')
+    )
+    not_viewed = models.IntegerField(default=0,
+                                     verbose_name=_('not viewed events'))
+
+    objects = EventCounterQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = _('Event counter')
+        verbose_name_plural = _('Event counters')
+
+    def __str__(self):
+        return '%s: %s' % (self.user_id, self.not_viewed)
+
+
 def get_event_model():
     """
     Helper for getting event swappable model.
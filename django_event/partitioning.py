@@ -0,0 +1,568 @@
+# -*- coding: utf-8 -*-
+
+"""
+Event table partitioning module.
+
+Optional storage mode for PostgreSQL 11+. Event table is declaratively
+partitioned by ``created_at`` range into daily or weekly partitions, so
+expired events are removed by dropping whole partitions instead of
+deleting rows. Models and querysets work with partitioned table unchanged.
+
+Table is converted by ``django_event`` migrations when ``PARTITIONING``
+setting is on, and converted back when they are unapplied. Swapped event
+models may call :func:`partition_table` and :func:`unpartition_table` from
+``RunPython`` operations of their own migrations.
+
+Rows out of all partition ranges are kept in the ``DEFAULT`` partition.
+They are moved into the new partition when it's created, and are removed
+by ``deleteoldevents`` as usual.
+
+Note that partitions are dropped by creation time regardless of viewed
+flag, retention is ``STORE_DAYS`` plus the partition interval at most.
+Tables referencing event table by foreign key can't be partitioned.
+"""
+
+
+from __future__ import unicode_literals
+
+from datetime import datetime
+from datetime import timedelta
+
+from django.conf import settings as app_settings
+from django.db import connections
+from django.db import transaction
+from django.utils import timezone
+
+from django_event import settings
+
+
+DAILY = 'daily'
+WEEKLY = 'weekly'
+
+INTERVALS = {
+    DAILY: timedelta(days=1),
+    WEEKLY: timedelta(weeks=1),
+}
+
+PARTITION_COLUMN = 'created_at'
+PARTITION_NAME_FORMAT = '%Y%m%d'
+
+# Range partitions with their bounds. Bounds are always midnights, so they
+# are fetched as dates in the connection time zone.
+PARTITIONS_SQL = r'''
+SELECT relname, bounds[1]::timestamptz::date, bounds[2]::timestamptz::date
+FROM (
+    SELECT child.relname, regexp_match(
+        pg_get_expr(child.relpartbound, child.oid),
+        'FROM \(''([^'']+)''\) TO \(''([^'']+)''\)'
+    ) AS bounds
+    FROM pg_inherits
+    JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+    WHERE pg_inherits.inhparent = %s::regclass
+) partitions
+WHERE bounds IS NOT NULL
+ORDER BY 2
+'''
+
+
+class PartitioningError(Exception):
+    """
+    Partitioning isn't configured or isn't supported by database.
+    """
+
+
+def get_connection(using):
+    """
+    Get database connection, checks if partitioning is supported.
+
+    :param using: Database alias.
+    :type using: :class:`str`
+
+    :return: Database connection.
+
+    :raise: :class:`PartitioningError` if database isn't PostgreSQL 11+.
+    """
+
+    connection = connections[using]
+    if connection.vendor != 'postgresql' or connection.pg_version < 110000:
+        raise PartitioningError('Event partitioning requires PostgreSQL 11+')
+    return connection
+
+
+def get_interval(interval=None):
+    """
+    Get partitioning interval.
+
+    :param interval: ``daily`` or ``weekly``, PARTITIONING setting by
+        default.
+    :type interval: :class:`str`
+
+    :return: Partitioning interval.
+    :rtype: :class:`str`
+
+    :raise: :class:`PartitioningError` if interval is unknown.
+    """
+
+    interval = interval or settings.PARTITIONING
+    if interval not in INTERVALS:
+        raise PartitioningError(
+            'PARTITIONING setting must be one of: %s' %
+            ', '.join(sorted(INTERVALS))
+        )
+    return interval
+
+
+def partition_start(value, interval):
+    """
+    Get start date of partition containing given date.
+
+    :param value: Date.
+    :type value: :class:`datetime.date`
+
+    :param interval: Partitioning interval.
+    :type interval: :class:`str`
+
+    :return: Partition start date.
+    :rtype: :class:`datetime.date`
+    """
+
+    if interval == WEEKLY:
+        return value - timedelta(days=value.weekday())
+    return value
+
+
+def partition_name(table, start):
+    """
+    Get partition table name.
+
+    :param table: Partitioned table name.
+    :type table: :class:`str`
+
+    :param start: Partition start date.
+    :type start: :class:`datetime.date`
+
+    :return: Partition table name e.g. django_event_event_p20150131.
+    :rtype: :class:`str`
+    """
+
+    return '%s_p%s' % (table, start.strftime(PARTITION_NAME_FORMAT))
+
+
+def default_partition_name(table):
+    """
+    Get default partition table name.
+
+    :param table: Partitioned table name.
+    :type table: :class:`str`
+
+    :return: Default partition table name e.g. django_event_event_default.
+    :rtype: :class:`str`
+    """
+
+    return '%s_default' % table
+
+
+def to_datetime(value):
+    """
+    Converts partition bound date into database datetime.
+
+    :param value: Date.
+    :type value: :class:`datetime.date`
+
+    :return: Midnight datetime, aware if USE_TZ is on.
+    :rtype: :class:`datetime.datetime`
+    """
+
+    value = datetime(value.year, value.month, value.day)
+    if app_settings.USE_TZ:
+        value = timezone.make_aware(value, timezone.utc)
+    return value
+
+
+def today():
+    """
+    Current date in database connection time zone.
+
+    :return: Current date.
+    :rtype: :class:`datetime.date`
+    """
+
+    now = timezone.now()
+    if timezone.is_aware(now):
+        now = now.astimezone(timezone.utc)
+    return now.date()
+
+
+def is_partitioned(model, using='default'):
+    """
+    Checks if model table is partitioned.
+
+    :param model: Event model.
+
+    :param using: Database alias.
+    :type using: :class:`str`
+
+    :return: True if table is partitioned.
+    :rtype: :class:`bool`
+    """
+
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return False
+
+    cursor = connection.cursor()
+    cursor.execute(
+        "SELECT relkind = 'p' FROM pg_class WHERE oid = %s::regclass",
+        [connection.ops.quote_name(model._meta.db_table)]
+    )
+    return cursor.fetchone()[0]
+
+
+def get_partitions(model, using='default'):
+    """
+    Get range partitions of model table. Default partition isn't included.
+
+    :param model: Event model.
+
+    :param using: Database alias.
+    :type using: :class:`str`
+
+    :return: Partition name, start and end date tuples ordered by start.
+    :rtype: :class:`list`
+    """
+
+    connection = get_connection(using)
+    cursor = connection.cursor()
+    cursor.execute(
+        PARTITIONS_SQL, [connection.ops.quote_name(model._meta.db_table)]
+    )
+    return cursor.fetchall()
+
+
+def create_partition(model, start, end, using='default'):
+    """
+    Creates partition for given date range. Rows of the range are moved
+    into it from the default partition.
+
+    :param model: Event model.
+
+    :param start: Partition start date.
+    :type start: :class:`datetime.date`
+
+    :param end: Partition end date, exclusive.
+    :type end: :class:`datetime.date`
+
+    :param using: Database alias.
+    :type using: :class:`str`
+
+    :return: Created partition name.
+    :rtype: :class:`str`
+    """
+
+    connection = get_connection(using)
+    quote_name = connection.ops.quote_name
+    table = model._meta.db_table
+    name = partition_name(table, start)
+    default = quote_name(default_partition_name(table))
+    column = quote_name(PARTITION_COLUMN)
+    bounds = [to_datetime(start), to_datetime(end)]
+
+    with transaction.atomic(using=using):
+        cursor = connection.cursor()
+        # Rows can't be routed into the default partition while it's checked.
+        cursor.execute('LOCK TABLE %s IN EXCLUSIVE MODE' % default)
+        cursor.execute(
+            'SELECT 1 FROM %s WHERE %s >= %%s AND %s < %%s LIMIT 1' % (
+                default, column, column
+            ),
+            bounds
+        )
+        if cursor.fetchone() is None:
+            cursor.execute(
+                'CREATE TABLE %s PARTITION OF %s '
+                'FOR VALUES FROM (%%s) TO (%%s)' % (
+                    quote_name(name), quote_name(table)
+                ),
+                bounds
+            )
+            return name
+
+        cursor.execute(
+            'CREATE TABLE %s (LIKE %s INCLUDING DEFAULTS INCLUDING '
+            'CONSTRAINTS)' % (quote_name(name), quote_name(table))
+        )
+        cursor.execute(
+            'WITH moved AS (DELETE FROM %s WHERE %s >= %%s AND %s < %%s '
+            'RETURNING *) INSERT INTO %s SELECT * FROM moved' % (
+                default, column, column, quote_name(name)
+            ),
+            bounds
+        )
+        cursor.execute(
+            'ALTER TABLE %s ATTACH PARTITION %s '
+            'FOR VALUES FROM (%%s) TO (%%s)' % (
+                quote_name(table), quote_name(name)
+            ),
+            bounds
+        )
+    return name
+
+
+def create_partitions(model, ahead=None, interval=None, since=None,
+                      using='default'):
+    """
+    Creates missing partitions after the last existing one up to the given
+    amount of partitions ahead of today.
+
+    :param model: Event model.
+
+    :param ahead: Future partitions count, PARTITIONS_AHEAD by default.
+    :type ahead: :class:`int`
+
+    :param interval: Partitioning interval, PARTITIONING by default.
+    :type interval: :class:`str`
+
+    :param since: First partition date if table has no partitions yet,
+        today by default.
+    :type since: :class:`datetime.date`
+
+    :param using: Database alias.
+    :type using: :class:`str`
+
+    :return: Created partition names.
+    :rtype: :class:`list`
+    """
+
+    interval = get_interval(interval)
+    ahead = settings.PARTITIONS_AHEAD if ahead is None else ahead
+    partitions = get_partitions(model, using)
+
+    if partitions:
+        start = partitions[-1][2]
+    else:
+        start = partition_start(since or today(), interval)
+    last = partition_start(today(), interval) + INTERVALS[interval] * ahead
+
+    created = []
+    while start <= last:
+        # Partitions are aligned to interval even if it was changed.
+        end = partition_start(start, interval) + INTERVALS[interval]
+        created.append(create_partition(model, start, end, using))
+        start = end
+    return created
+
+
+def drop_expired_partitions(model, store_days=None, using='default'):
+    """
+    Drops partitions containing only events older than given amount of days.
+    Not viewed counters of users having events in dropped partition are
+    decremented.
+
+    :param model: Event model.
+
+    :param store_days: Days to keep events, STORE_DAYS by default.
+    :type store_days: :class:`int`
+
+    :param using: Database alias.
+    :type using: :class:`str`
+
+    :return: Dropped partition names.
+    :rtype: :class:`list`
+    """
+
+    from django_event.models import EventCounter
+
+    connection = get_connection(using)
+    quote_name = connection.ops.quote_name
+    store_days = settings.STORE_DAYS if store_days is None else store_days
+    cutoff = today() - timedelta(days=store_days)
+    user_column = model._meta.get_field('user').column
+    viewed_column = model._meta.get_field('viewed').column
+
+    dropped = []
+    for name, start, end in get_partitions(model, using):
+        if end > cutoff:
+            break
+        with transaction.atomic(using=using):
+            cursor = connection.cursor()
+            cursor.execute('LOCK TABLE %s' % quote_name(name))
+            cursor.execute(
+                'SELECT %s, COUNT(*) FROM %s WHERE NOT %s GROUP BY %s' % (
+                    quote_name(user_column), quote_name(name),
+                    quote_name(viewed_column), quote_name(user_column)
+                )
+            )
+            not_viewed = cursor.fetchall()
+            cursor.execute('DROP TABLE %s' % quote_name(name))
+            for user_id, count in not_viewed:
+                EventCounter.objects.using(using).add(user_id, -count)
+        dropped.append(name)
+    return dropped
+
+
+def get_table_definitions(cursor, table, quote_name):
+    """
+    Get definitions of table indexes and constraints to be recreated on
+    converted table. Check constraints are copied with table and primary
+    key depends on partitioning, so they aren't included.
+
+    :param cursor: Database cursor.
+
+    :param table: Quoted table name.
+    :type table: :class:`str`
+
+    :param quote_name: Database identifier quoting function.
+    :type quote_name: callable object
+
+    :return: Primary key name and list of index and constraint SQL.
+    :rtype: :class:`tuple`
+    """
+
+    cursor.execute(
+        "SELECT conname FROM pg_constraint "
+        "WHERE conrelid = %s::regclass AND contype = 'p'",
+        [table]
+    )
+    primary_key, = cursor.fetchone()
+
+    cursor.execute(
+        'SELECT pg_get_indexdef(indexrelid) FROM pg_index '
+        'WHERE indrelid = %s::regclass AND NOT EXISTS ('
+        'SELECT 1 FROM pg_constraint WHERE conindid = indexrelid) '
+        'ORDER BY 1',
+        [table]
+    )
+    # Indexes of partitioned table are defined on it only.
+    definitions = [
+        sql.replace(' ON ONLY ', ' ON ', 1) for sql, in cursor.fetchall()
+    ]
+
+    cursor.execute(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = %s::regclass AND contype IN ('f', 'u') "
+        "ORDER BY conname",
+        [table]
+    )
+    definitions.extend(
+        'ALTER TABLE %s ADD CONSTRAINT %s %s' % (table, quote_name(name), sql)
+        for name, sql in cursor.fetchall()
+    )
+    return primary_key, definitions
+
+
+def rebuild_table(model, using, partitioned, create=lambda: None):
+    """
+    Recreates model table as partitioned or regular one and copies rows
+    into it. Table is locked for the whole conversion.
+
+    :param model: Event model.
+
+    :param using: Database alias.
+    :type using: :class:`str`
+
+    :param partitioned: Create partitioned table if True.
+    :type partitioned: :class:`bool`
+
+    :param create: Called after new table is created, before rows copying.
+    :type create: callable object
+    """
+
+    connection = get_connection(using)
+    quote_name = connection.ops.quote_name
+    table = quote_name(model._meta.db_table)
+    old_table = quote_name('%s_old' % model._meta.db_table)
+    primary_key = [quote_name(model._meta.pk.column)]
+    if partitioned:
+        primary_key.append(quote_name(PARTITION_COLUMN))
+
+    with transaction.atomic(using=using):
+        cursor = connection.cursor()
+        cursor.execute('LOCK TABLE %s' % table)
+        primary_key_name, definitions = get_table_definitions(cursor, table,
+                                                              quote_name)
+        cursor.execute('SELECT pg_get_serial_sequence(%s, %s)',
+                       [table, model._meta.pk.column])
+        sequence, = cursor.fetchone()
+
+        cursor.execute('ALTER TABLE %s RENAME TO %s' % (table, old_table))
+        cursor.execute(
+            'CREATE TABLE %s (LIKE %s INCLUDING DEFAULTS INCLUDING '
+            'CONSTRAINTS)%s' % (
+                table, old_table,
+                ' PARTITION BY RANGE (%s)' % quote_name(PARTITION_COLUMN)
+                if partitioned else ''
+            )
+        )
+        # Sequence would be dropped with old table otherwise.
+        if sequence:
+            cursor.execute('ALTER SEQUENCE %s OWNED BY %s.%s' % (
+                sequence, table, primary_key[0]
+            ))
+        create()
+
+        cursor.execute(
+            'INSERT INTO %s SELECT * FROM %s' % (table, old_table)
+        )
+        cursor.execute('DROP TABLE %s' % old_table)
+
+        # Old table index and constraint names are free now.
+        cursor.execute('ALTER TABLE %s ADD CONSTRAINT %s PRIMARY KEY (%s)' % (
+            table, quote_name(primary_key_name), ', '.join(primary_key)
+        ))
+        for sql in definitions:
+            cursor.execute(sql)
+
+
+def partition_table(model, interval=None, ahead=None, store_days=None,
+                    using='default'):
+    """
+    Converts regular model table into partitioned one with default
+    partition and partitions from ``store_days`` ago up to ``ahead``
+    partitions ahead of today. Existing rows are copied into partitions.
+    Primary key is extended with ``created_at`` column as partitioned tables
+    require it, Django still uses ``id`` alone.
+
+    :param model: Event model.
+
+    :param interval: Partitioning interval, PARTITIONING by default.
+    :type interval: :class:`str`
+
+    :param ahead: Future partitions count, PARTITIONS_AHEAD by default.
+    :type ahead: :class:`int`
+
+    :param store_days: Days to keep events, STORE_DAYS by default.
+    :type store_days: :class:`int`
+
+    :param using: Database alias.
+    :type using: :class:`str`
+    """
+
+    interval = get_interval(interval)
+    store_days = settings.STORE_DAYS if store_days is None else store_days
+    connection = get_connection(using)
+    quote_name = connection.ops.quote_name
+    table = model._meta.db_table
+
+    def create():
+        connection.cursor().execute(
+            'CREATE TABLE %s PARTITION OF %s DEFAULT' % (
+                quote_name(default_partition_name(table)), quote_name(table)
+            )
+        )
+        create_partitions(model, ahead, interval,
+                          today() - timedelta(days=store_days), using)
+
+    rebuild_table(model, using, True, create)
+
+
+def unpartition_table(model, using='default'):
+    """
+    Converts partitioned model table back into regular one.
+
+    :param model: Event model.
+
+    :param using: Database alias.
+    :type using: :class:`str`
+    """
+
+    rebuild_table(model, using, False)
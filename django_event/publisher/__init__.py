@@ -1,3 +1,4 @@
 # -*- coding: utf-8 -*-
 
-from django_event.publisher.decorator import event
\ No newline at end of file
+from django_event.publisher import worker
+from django_event.publisher.decorator import event
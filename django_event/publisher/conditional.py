@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+"""
+Conditional GET support for event views. ETag and Last-Modified headers
+are computed from events count and last update time, a single aggregate
+query served by ``(user, updated_at)`` index, so unchanged polls get 304
+response without fetching and serializing events. Every event write
+touches ``updated_at``, including progress, viewed, canceled and retried
+flags.
+"""
+
+
+from __future__ import unicode_literals
+
+import hashlib
+
+from django.db.models import Count
+from django.db.models import Max
+from django.views.decorators.http import condition
+
+from django_event.models import Event
+
+
+def get_list_state(request):
+    """
+    Get user events state. State is cached on request as ETag and
+    Last-Modified are computed separately.
+
+    :param request: Incoming request.
+    :type request: :class:`HttpRequest`
+
+    :return: Aggregated events state.
+    :rtype: :class:`dict`
+    """
+
+    if not hasattr(request, '_event_list_state'):
+        request._event_list_state = Event.objects.filter(
+            user=request.user
+        ).aggregate(
+            count=Count('pk'),
+            updated_at=Max('updated_at'),
+        )
+    return request._event_list_state
+
+
+def get_detail_state(request, pk):
+    """
+    Get user event state. State is cached on request as ETag and
+    Last-Modified are computed separately.
+
+    :param request: Incoming request.
+    :type request: :class:`HttpRequest`
+
+    :param pk: Event id.
+    :type pk: :class:`int`
+
+    :return: Event state or None if event doesn't exist.
+    :rtype: :class:`dict`
+    """
+
+    if not hasattr(request, '_event_detail_state'):
+        request._event_detail_state = Event.objects.filter(
+            pk=pk, user=request.user
+        ).values('updated_at').first()
+    return request._event_detail_state
+
+
+def get_etag(request, state):
+    """
+    Computes ETag of given state. Url and Accept header are included as
+    response depends on pagination, requested fields and format.
+
+    :param request: Incoming request.
+    :type request: :class:`HttpRequest`
+
+    :param state: Events state.
+    :type state: :class:`dict`
+
+    :return: ETag.
+    :rtype: :class:`str`
+    """
+
+    key = '%s|%s|%s|%s' % (
+        request.user.pk,
+        request.get_full_path(),
+        request.META.get('HTTP_ACCEPT', ''),
+        sorted(state.items()),
+    )
+    return hashlib.md5(key.encode('utf-8')).hexdigest()
+
+
+def get_last_modified(state):
+    """
+    Get last modification time of given state.
+
+    :param state: Events state.
+    :type state: :class:`dict`
+
+    :return: Last modification time.
+    :rtype: :class:`datetime.datetime`
+    """
+
+    return state['updated_at']
+
+
+def list_etag(request, *args, **kwargs):
+    return get_etag(request, get_list_state(request))
+
+
+def list_last_modified(request, *args, **kwargs):
+    return get_last_modified(get_list_state(request))
+
+
+def detail_etag(request, pk, *args, **kwargs):
+    state = get_detail_state(request, pk)
+    return state and get_etag(request, state)
+
+
+def detail_last_modified(request, pk, *args, **kwargs):
+    state = get_detail_state(request, pk)
+    return state and get_last_modified(state)
+
+
+event_list_condition = condition(etag_func=list_etag,
+                                 last_modified_func=list_last_modified)
+
+event_detail_condition = condition(etag_func=detail_etag,
+                                   last_modified_func=detail_last_modified)
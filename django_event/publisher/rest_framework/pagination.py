@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+
+"""
+Pagination module for django rest_framework.
+"""
+
+from __future__ import unicode_literals
+
+import json
+from base64 import urlsafe_b64decode
+from base64 import urlsafe_b64encode
+from collections import OrderedDict
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.translation import ugettext_lazy as _
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class EventCursorPagination(BasePagination):
+    """
+    Keyset pagination by ``(completed_at, id)`` in descending order.
+    Page cost doesn't depend on page depth and pages don't shift when new
+    events complete.
+
+    Not completed events have no completion time, they go first ordered by
+    id. Each part is fetched by its own index friendly query instead of
+    relying on database specific NULL ordering.
+    """
+
+    cursor_query_param = 'cursor'
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 50
+    invalid_cursor_message = _('Invalid cursor')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Get page after cursor position.
+
+        :return: Page events.
+        :rtype: :class:`list`
+        """
+
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        completed_at, pk = self.decode_cursor(
+            request.query_params.get(self.cursor_query_param)
+        )
+        limit = self.page_size + 1
+
+        page = []
+        if completed_at is None:
+            not_completed = queryset.filter(completed_at__isnull=True)
+            if pk is not None:
+                not_completed = not_completed.filter(pk__lt=pk)
+            page = list(not_completed.order_by('-pk')[:limit])
+
+        if len(page) < limit:
+            completed = queryset.filter(completed_at__isnull=False)
+            if completed_at is not None:
+                completed = completed.filter(
+                    Q(completed_at__lt=completed_at) |
+                    Q(completed_at=completed_at, pk__lt=pk)
+                )
+            page += list(
+                completed.order_by('-completed_at', '-pk')[:limit - len(page)]
+            )
+
+        self.has_next = len(page) > self.page_size
+        self.page = page[:self.page_size]
+        return self.page
+
+    def get_page_size(self, request):
+        """
+        Get page size requested by client.
+
+        :return: Page size.
+        :rtype: :class:`int`
+        """
+
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def decode_cursor(self, encoded):
+        """
+        Decodes cursor position.
+
+        :param encoded: Cursor from query string.
+        :type encoded: :class:`str`
+
+        :return: Completion time and id of the last seen event.
+        :rtype: :class:`tuple`
+
+        :raise: :class:`NotFound` if cursor is invalid.
+        """
+
+        if encoded is None:
+            return None, None
+
+        try:
+            completed_at, pk = json.loads(
+                urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8')
+            )
+            pk = int(pk)
+            if completed_at is not None:
+                completed_at = parse_datetime(completed_at)
+                if completed_at is None:
+                    raise ValueError
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        return completed_at, pk
+
+    def encode_cursor(self, event):
+        """
+        Encodes event position.
+
+        :param event: Last event of the page.
+        :type event: :class:`Event`
+
+        :return: Cursor.
+        :rtype: :class:`str`
+        """
+
+        completed_at = event.completed_at
+        if completed_at is not None:
+            completed_at = completed_at.isoformat()
+        return urlsafe_b64encode(
+            json.dumps([completed_at, event.pk]).encode('utf-8')
+        ).decode('ascii')
+
+    def get_next_link(self):
+        """
+        Get next page link.
+
+        :return: Next page url, None on the last page.
+        :rtype: :class:`str`
+        """
+
+        if not self.has_next:
+            return None
+        return replace_query_param(self.base_url, self.cursor_query_param,
+                                   self.encode_cursor(self.page[-1]))
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('results', data),
+        ]))
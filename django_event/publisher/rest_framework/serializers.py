@@ -29,7 +29,32 @@ class LocalDateTimeField(serializers.DateTimeField):
         )
 
 
-class EventSerializer(serializers.ModelSerializer):
+# Large text columns excluded from event lists.
+DEFERRED_FIELDS = ('result', 'event_request')
+
+
+class DynamicFieldsMixin(object):
+    """
+    Serializer mixin restricting serialized fields to the ones passed in
+    ``fields`` keyword argument.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """
+        Initialize serializer.
+
+        :param fields: Fields to be serialized, all fields if None.
+        :type fields: :class:`list`
+        """
+
+        fields = kwargs.pop('fields', None)
+        super(DynamicFieldsMixin, self).__init__(*args, **kwargs)
+        if fields is not None:
+            for field_name in set(self.fields) - set(fields):
+                self.fields.pop(field_name)
+
+
+class EventSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Specifies which fields should be serialized and overrides date fields to
     return local time instead of server time.
@@ -38,6 +63,16 @@ class EventSerializer(serializers.ModelSerializer):
     created_at = LocalDateTimeField()
     started_at = LocalDateTimeField()
     completed_at = LocalDateTimeField()
+    updated_at = LocalDateTimeField()
 
     class Meta:
-        model = Event
\ No newline at end of file
+        model = Event
+
+
+class EventListSerializer(EventSerializer):
+    """
+    Slim event serializer for lists, large text fields are omitted.
+    """
+
+    class Meta(EventSerializer.Meta):
+        exclude = DEFERRED_FIELDS
@@ -10,6 +10,11 @@ Urls for django. ::
             event_list,
             name='event_list'
         ),
+        url(
+            r'^cursor/$',
+            event_cursor_list,
+            name='event_cursor_list'
+        ),
         url(
             r'^(?P<pk>[0-9]+)/$',
             event_detail,
@@ -35,8 +40,11 @@ from __future__ import unicode_literals
 from django.conf.urls import patterns, url
 
 from django_event.publisher.rest_framework.views import event_list
+from django_event.publisher.rest_framework.views import event_cursor_list
 from django_event.publisher.rest_framework.views import event_detail
 from django_event.publisher.rest_framework.views import event_types
+from django_event.publisher.rest_framework.views import not_viewed_count
+from django_event.publisher.rest_framework.views import mark_viewed
 from django_event.publisher.rest_framework.views import cancel_event
 from django_event.publisher.rest_framework.views import retry_event
 
@@ -48,6 +56,11 @@ urlpatterns = patterns(
         event_list,
         name='event_list'
     ),
+    url(
+        r'^cursor/$',
+        event_cursor_list,
+        name='event_cursor_list'
+    ),
     url(
         r'^(?P<pk>[0-9]+)/$',
         event_detail,
@@ -58,6 +71,16 @@ urlpatterns = patterns(
         event_types,
         name='event_types'
     ),
+    url(
+        r'^not_viewed/$',
+        not_viewed_count,
+        name='not_viewed_count'
+    ),
+    url(
+        r'^viewed/$',
+        mark_viewed,
+        name='mark_viewed'
+    ),
     url(
         r'^(?P<pk>[0-9]+)/cancel/$',
         cancel_event,
@@ -9,27 +9,79 @@ from __future__ import unicode_literals
 
 from django.http.response import Http404
 from django.db.models import ObjectDoesNotExist
+from django.utils.decorators import method_decorator
 from rest_framework import status
 from rest_framework.filters import OrderingFilter
 from rest_framework.generics import ListAPIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.exceptions import NotFound
+from rest_framework.exceptions import ParseError
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from django_event import settings
 from django_event.models import Event
+from django_event.models import EventCounter
+from django_event.utils import parse_ids
+from django_event.publisher.conditional import event_detail_condition
+from django_event.publisher.conditional import event_list_condition
+from django_event.publisher.rest_framework.pagination import \
+    EventCursorPagination
+from django_event.publisher.rest_framework.serializers import DEFERRED_FIELDS
 from django_event.publisher.rest_framework.serializers import EventSerializer
+from django_event.publisher.rest_framework.serializers import \
+    EventListSerializer
 
 
-class EventListView(ListAPIView):
+class EventFieldsMixin(object):
     """
-    List all user events.
+    Event view mixin selecting serialized fields by ``fields`` query
+    parameter e.g. ``?fields=id,status,result``.
+    """
+
+    fields_query_param = 'fields'
+
+    def get_requested_fields(self):
+        """
+        Get fields requested by client.
+
+        :return: Field names or None if not requested.
+        :rtype: :class:`list`
+        """
+
+        fields = self.request.query_params.get(self.fields_query_param)
+        if not fields:
+            return None
+        return [field for field in fields.split(',') if field]
+
+    def get_serializer(self, *args, **kwargs):
+        """
+        Passes requested fields into serializer.
+        """
+
+        fields = self.get_requested_fields()
+        if fields is not None:
+            kwargs['fields'] = fields
+        kwargs.setdefault('context', {
+            'request': self.request,
+            'format': self.format_kwarg,
+            'view': self,
+        })
+        return self.get_serializer_class()(*args, **kwargs)
+
+    def get_serializer_class(self):
+        return self.serializer_class
+
+
+class EventListView(EventFieldsMixin, ListAPIView):
+    """
+    List all user events. Large text fields aren't fetched unless requested
+    by ``fields`` query parameter.
     """
 
     queryset = Event.objects.all()
-    serializer_class = EventSerializer
+    serializer_class = EventListSerializer
     filter_backends = (OrderingFilter, )
     max_paginate_by = 50
     paginate_by = 10
@@ -37,6 +89,7 @@ class EventListView(ListAPIView):
     ordering = ('-completed_at', )
     permission_classes = (IsAuthenticated, )
 
+    @method_decorator(event_list_condition)
     def get(self, request, *args, **kwargs):
         """
         Get user events
@@ -46,15 +99,53 @@ class EventListView(ListAPIView):
 
         return super(EventListView, self).get(request, *args, **kwargs)
 
+    def get_serializer_class(self):
+        if self.get_requested_fields() is not None:
+            return EventSerializer
+        return self.serializer_class
+
     def get_queryset(self):
         qs = super(EventListView, self).get_queryset().filter(
             user=self.request.user)
-        return qs
+        fields = self.get_requested_fields() or ()
+        return qs.defer(*[
+            field for field in DEFERRED_FIELDS if field not in fields
+        ])
 
 event_list = EventListView.as_view()
 
 
-class EventDetailView(APIView):
+class EventCursorListView(EventListView):
+    """
+    List all user events using cursor pagination. Ordered by completion time
+    and id, ordering can't be changed.
+    """
+
+    filter_backends = ()
+    pagination_class = EventCursorPagination
+
+    def get(self, request, *args, **kwargs):
+        """
+        Get user events page after cursor
+        ---
+
+        parameters:
+            - name: cursor
+              required: false
+              type: string
+              paramType: query
+            - name: page_size
+              required: false
+              type: integer
+              paramType: query
+        """
+
+        return super(EventCursorListView, self).get(request, *args, **kwargs)
+
+event_cursor_list = EventCursorListView.as_view()
+
+
+class EventDetailView(EventFieldsMixin, APIView):
     """
     Retrieve specific user event.
     """
@@ -63,6 +154,7 @@ class EventDetailView(APIView):
     serializer_class = EventSerializer
     permission_classes = (IsAuthenticated, )
 
+    @method_decorator(event_detail_condition)
     def get(self, request, pk):
         """
         Get event by id
@@ -73,7 +165,7 @@ class EventDetailView(APIView):
         try:
             event = Event.objects.get(pk=pk)
             if event.user == request.user:
-                serializer = self.serializer_class(event)
+                serializer = self.get_serializer(event)
                 return Response(serializer.data)
             raise PermissionDenied()
         except ObjectDoesNotExist:
@@ -101,6 +193,78 @@ class EventTypesView(APIView):
 event_types = EventTypesView.as_view()
 
 
+class NotViewedCountView(APIView):
+    """
+    Not viewed events count view.
+    """
+
+    permission_classes = (IsAuthenticated, )
+
+    def get(self, request):
+        """
+        Return cached count of user not viewed events.
+        """
+
+        return Response({
+            "not_viewed": EventCounter.objects.get_not_viewed(request.user)
+        })
+
+not_viewed_count = NotViewedCountView.as_view()
+
+
+class MarkViewedView(APIView):
+    """
+    Mark user completed events viewed.
+    """
+
+    permission_classes = (IsAuthenticated, )
+
+    def post(self, request):
+        """
+        Mark events viewed by ids or all events up to given id
+
+        At most VIEWED_MAX_IDS ids are accepted, use up_to for larger ranges.
+        ---
+
+        parameters:
+            - name: ids
+              required: false
+              type: string
+              paramType: form
+            - name: up_to
+              required: false
+              type: integer
+              paramType: form
+        """
+
+        if hasattr(request.data, 'getlist'):
+            ids = request.data.getlist('ids')
+        else:
+            ids = request.data.get('ids') or []
+
+        try:
+            ids = parse_ids(ids) or None
+            up_to = request.data.get('up_to')
+            up_to = parse_ids(up_to)[0] if up_to else None
+        except (ValueError, IndexError):
+            raise ParseError()
+        if ids is None and up_to is None:
+            raise ParseError('Pass ids or up_to')
+        if ids and len(ids) > settings.VIEWED_MAX_IDS:
+            raise ParseError(
+                'Pass at most %s ids, use up_to for larger ranges' %
+                settings.VIEWED_MAX_IDS
+            )
+
+        viewed = Event.mark_viewed_by_user(request.user, ids, up_to)
+        return Response({
+            "viewed": viewed,
+            "not_viewed": EventCounter.objects.get_not_viewed(request.user)
+        })
+
+mark_viewed = MarkViewedView.as_view()
+
+
 class CancelEventView(APIView):
     """
     Cancel executing event.
@@ -125,8 +289,8 @@ class CancelEventView(APIView):
 
         try:
             event = Event.objects.get(pk=pk)
-            if event.user == request.user and event.may_be_canceled:
-                event.cancel()
+            if (event.user == request.user and event.may_be_canceled and
+                    event.cancel()):
                 return Response(status=status.HTTP_200_OK)
             raise PermissionDenied()
         except ObjectDoesNotExist:
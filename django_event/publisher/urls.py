@@ -38,6 +38,8 @@ from django.conf.urls import url
 from django_event.publisher.views import event_list
 from django_event.publisher.views import event_detail
 from django_event.publisher.views import event_types
+from django_event.publisher.views import not_viewed_count
+from django_event.publisher.views import mark_viewed
 from django_event.publisher.views import cancel_event
 from django_event.publisher.views import retry_event
 
@@ -59,6 +61,16 @@ urlpatterns = patterns(
         event_types,
         name='event_types'
     ),
+    url(
+        r'^not_viewed/$',
+        not_viewed_count,
+        name='not_viewed_count'
+    ),
+    url(
+        r'^viewed/$',
+        mark_viewed,
+        name='mark_viewed'
+    ),
     url(
         r'^(?P<pk>[0-9]+)/cancel/$',
         cancel_event,
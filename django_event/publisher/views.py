@@ -11,8 +11,8 @@ import json
 
 from django.contrib.auth.decorators import login_required
 from django.http.response import HttpResponse
+from django.http.response import HttpResponseBadRequest
 from django.shortcuts import get_object_or_404
-from django.shortcuts import get_list_or_404
 from django.utils.decorators import method_decorator
 from django.views.generic.base import View
 from django.views.generic.detail import DetailView
@@ -20,6 +20,10 @@ from django.views.generic.list import ListView
 
 from django_event import settings
 from django_event.models import Event
+from django_event.models import EventCounter
+from django_event.utils import parse_ids
+from django_event.publisher.conditional import event_detail_condition
+from django_event.publisher.conditional import event_list_condition
 
 
 class LoginRequiredMixin(object):
@@ -54,21 +58,31 @@ class EventListMixin(object):
 
     def get_queryset(self):
         """
-        Returns user-owned events.
+        Returns user-owned events. Queryset is lazy, so it's paginated and
+        filtered by database.
 
         :return: QuerySet of user-owned events.
         :rtype: :class:`EventQuerySet`
         """
 
-        return get_list_or_404(self.model, user=self.request.user)
+        return self.model.objects.filter(
+            user=self.request.user
+        ).order_by('-completed_at', '-pk')
 
 
 class EventListView(LoginRequiredMixin,
                     EventListMixin, ListView):
     """
-    Base event list view class.
+    Base event list view class. Responds with 404 if user has no events.
     """
 
+    allow_empty = False
+    paginate_by = 10
+
+    @method_decorator(event_list_condition)
+    def get(self, request, *args, **kwargs):
+        return super(EventListView, self).get(request, *args, **kwargs)
+
 event_list = EventListView.as_view()
 
 
@@ -77,15 +91,25 @@ class EventDetailMixin(EventListMixin):
     Event view mixin class with overrided :func:`get_object` method.
     """
 
-    def get_object(self, pk, queryset=None):
+    def get_object(self, queryset=None, pk=None):
         """
-        Returns user-owned event by id.
+        Returns user-owned event by id using single query.
 
-        :return: QuerySet of user-owned events.
+        :param queryset: Events to look up, user-owned events by default.
+        :type queryset: :class:`EventQuerySet`
+
+        :param pk: Event id, taken from url if omitted.
+        :type pk: :class:`int`
+
+        :return: User-owned event.
         :rtype: :class:`Event`
         """
 
-        return get_object_or_404(self.get_queryset(), pk=pk)
+        if queryset is None:
+            queryset = self.get_queryset()
+        if pk is None:
+            pk = self.kwargs.get('pk')
+        return get_object_or_404(queryset, pk=pk)
 
 
 class EventDetailView(LoginRequiredMixin,
@@ -94,6 +118,10 @@ class EventDetailView(LoginRequiredMixin,
     Base event detail view class.
     """
 
+    @method_decorator(event_detail_condition)
+    def get(self, request, *args, **kwargs):
+        return super(EventDetailView, self).get(request, *args, **kwargs)
+
 event_detail = EventDetailView.as_view()
 
 
@@ -115,6 +143,59 @@ class EventTypesView(LoginRequiredMixin,
 event_types = EventTypesView.as_view()
 
 
+class NotViewedCountView(LoginRequiredMixin,
+                         View):
+    """
+    Not viewed events count view.
+    """
+
+    def get(self, request):
+        """
+        Return cached count of user not viewed events.
+        """
+
+        return HttpResponse(json.dumps({
+            "not_viewed": EventCounter.objects.get_not_viewed(request.user)
+        }))
+
+not_viewed_count = NotViewedCountView.as_view()
+
+
+class MarkViewedView(LoginRequiredMixin,
+                     View):
+    """
+    Marks user completed events viewed by ``ids`` or all events ``up_to``
+    given id. At most ``VIEWED_MAX_IDS`` ids are accepted.
+    """
+
+    def post(self, request):
+        """
+        Return marked events count and not viewed events count.
+        """
+
+        try:
+            ids = parse_ids(request.POST.getlist('ids')) or None
+            up_to = request.POST.get('up_to')
+            up_to = parse_ids(up_to)[0] if up_to else None
+        except (ValueError, IndexError):
+            return HttpResponseBadRequest()
+        if ids is None and up_to is None:
+            return HttpResponseBadRequest()
+        if ids and len(ids) > settings.VIEWED_MAX_IDS:
+            return HttpResponseBadRequest(
+                'Pass at most %s ids, use up_to for larger ranges' %
+                settings.VIEWED_MAX_IDS
+            )
+
+        viewed = Event.mark_viewed_by_user(request.user, ids, up_to)
+        return HttpResponse(json.dumps({
+            "viewed": viewed,
+            "not_viewed": EventCounter.objects.get_not_viewed(request.user)
+        }))
+
+mark_viewed = MarkViewedView.as_view()
+
+
 class CancelEventView(LoginRequiredMixin,
                       EventDetailMixin, View):
     """
@@ -132,11 +213,8 @@ class CancelEventView(LoginRequiredMixin,
         :rtype: :class:`bool`
         """
 
-        event = self.get_object(pk)
-        if event.may_be_canceled:
-            event.cancel()
-            return True
-        return False
+        event = self.get_object(pk=pk)
+        return event.may_be_canceled and event.cancel()
 
     def post(self, request, pk):
         return HttpResponse(self.cancel(pk))
@@ -162,7 +240,7 @@ class RetryEventView(LoginRequiredMixin,
         :rtype: :class:`int` or None
         """
 
-        event = self.get_object(pk)
+        event = self.get_object(pk=pk)
         return event.retry() if event.may_be_retried else None
 
     def post(self, request, pk):
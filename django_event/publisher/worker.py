@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+"""
+Celery worker integration module.
+Keeps one persistent publisher connection per worker process. Connection is
+established when worker process starts and reused by all events executed by
+the process.
+"""
+
+
+from __future__ import unicode_literals
+
+import logging
+
+from celery.signals import worker_process_init
+from celery.signals import worker_process_shutdown
+
+from django_event.backends import Backend
+from django_event.backends.base import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+@worker_process_init.connect
+def connect_publisher(**kwargs):
+    """
+    Connects publisher of new worker process. Publisher inherited from parent
+    process is dropped. If broker is unavailable publisher will be connected
+    by the first event.
+    """
+
+    if not settings.PERSISTENT_CONNECTION:
+        return
+
+    Backend.reset_blocking_publisher()
+    try:
+        Backend.get_blocking_publisher().ensure_connected()
+    except Exception:
+        logger.exception('Failed to connect event publisher')
+
+
+@worker_process_shutdown.connect
+def disconnect_publisher(**kwargs):
+    """
+    Disconnects publisher of stopping worker process.
+    """
+
+    if not settings.PERSISTENT_CONNECTION:
+        return
+
+    try:
+        Backend.get_blocking_publisher().disconnect()
+    except Exception:
+        logger.exception('Failed to disconnect event publisher')
@@ -11,6 +11,8 @@ Available django-event settings:
 
 from __future__ import unicode_literals
 
+from multiprocessing import cpu_count
+
 from django.conf import settings
 
 
@@ -22,10 +24,60 @@ BACKEND_OPTIONS = event_settings.get('BACKEND_OPTIONS', {})
 
 TORNADO_OPTIONS = event_settings.get('TORNADO_OPTIONS', {})
 
+# Websocket authentication. AUTH_POOL_SIZE threads load users by session,
+# connections are rejected while AUTH_BACKLOG sessions are being loaded.
+# Loaded users are cached for AUTH_CACHE_TTL seconds, AUTH_CACHE_SIZE at most.
+AUTH_POOL_SIZE = event_settings.get('AUTH_POOL_SIZE', cpu_count())
+AUTH_BACKLOG = event_settings.get('AUTH_BACKLOG', 1000)
+AUTH_CACHE_SIZE = event_settings.get('AUTH_CACHE_SIZE', 10000)
+AUTH_CACHE_TTL = event_settings.get('AUTH_CACHE_TTL', 30)
+
+# Websocket connection queues up to OUTBOUND_QUEUE_SIZE frames while client
+# isn't keeping up. OUTBOUND_POLICY handles full queue, one of 'drop_oldest',
+# 'coalesce' or 'disconnect', see django_event.subscriber.outbound.
+OUTBOUND_QUEUE_SIZE = event_settings.get('OUTBOUND_QUEUE_SIZE', 100)
+OUTBOUND_POLICY = event_settings.get('OUTBOUND_POLICY', 'coalesce')
+
 LISTENERS = event_settings.get('LISTENERS', {})
 
+# Routing strategies used by each event type e.g.
+# {'example_event_type': ('user.id', )}
+ROUTING_STRATEGIES = event_settings.get('ROUTING_STRATEGIES', {})
+
+# Publish user routed events into per user channels e.g.
+# example_event_type.user.id.1, broadcast events stay in example_event_type.
+USER_CHANNELS = event_settings.get('USER_CHANNELS', False)
+
 STORE_DAYS = event_settings.get('STORE_DAYS', 7)
 
+# Partition event table by created_at, None, 'daily' or 'weekly'. Requires
+# PostgreSQL 11+. Table is converted by django_event migrations, to change it
+# on migrated database unapply them to 0006_event_updated_at and apply again.
+# partitionevents command keeps PARTITIONS_AHEAD future partitions created.
+PARTITIONING = event_settings.get('PARTITIONING', None)
+PARTITIONS_AHEAD = event_settings.get('PARTITIONS_AHEAD', 3)
+
+# Event type of notifications sent when user marks events viewed. Add it to
+# LISTENERS and route it by 'user.id' in ROUTING_STRATEGIES to deliver them
+# to the user clients.
+VIEWED_EVENT_TYPE = event_settings.get('VIEWED_EVENT_TYPE', 'events_viewed')
+
+# Viewed endpoints accept at most VIEWED_MAX_IDS ids per request, larger
+# ranges are marked by up_to. Keep it below database bound parameters limit,
+# 999 for SQLite.
+VIEWED_MAX_IDS = event_settings.get('VIEWED_MAX_IDS', 500)
+
+# Old events are deleted by chunks of DELETE_BATCH_SIZE rows.
+DELETE_BATCH_SIZE = event_settings.get('DELETE_BATCH_SIZE', 1000)
+
+# Directory for old events archived by archiveevents command.
+ARCHIVE_DIR = event_settings.get('ARCHIVE_DIR', None)
+
+# Event progress is written to database when it changed at least by
+# PROGRESS_FLUSH_DELTA percents or PROGRESS_FLUSH_INTERVAL seconds passed.
+PROGRESS_FLUSH_INTERVAL = event_settings.get('PROGRESS_FLUSH_INTERVAL', 1.0)
+PROGRESS_FLUSH_DELTA = event_settings.get('PROGRESS_FLUSH_DELTA', 10.0)
+
 EVENT_MODEL = event_settings.get('EVENT_MODEL', 'django_event.Event')
 
 AVAILABLE_TYPES = [key for key in LISTENERS.iterkeys()]
\ No newline at end of file
@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+
+"""
+Websocket authentication module.
+
+Users are loaded by session key on a thread pool as :class:`Principal`
+snapshots. Principals are cached for a short time, concurrent
+authentications of the same session share single lookup and too deep
+authentication backlog is rejected, so reconnect storms don't queue behind
+the pool.
+"""
+
+
+from __future__ import unicode_literals
+
+import time
+from collections import OrderedDict
+
+from concurrent.futures import ThreadPoolExecutor
+from django import db
+from django.conf import settings
+from django.contrib.auth import get_user as _get_user
+from django.contrib.sessions.exceptions import InvalidSessionKey
+from django.utils.importlib import import_module
+from tornado import gen
+
+from django_event import settings as event_settings
+from django_event.subscriber.principal import Principal
+
+
+_engine = import_module(settings.SESSION_ENGINE)
+
+
+class _Request(object):
+    """
+    Private class that emulates Django Request class.
+    """
+
+    pass
+
+
+class AuthBacklogFull(Exception):
+    """
+    Raised when too many authentications are in progress.
+    """
+
+
+def get_session(session_key):
+    """
+    Returns Django session instance by session key.
+
+    :param session_key: Session key given through websocket.
+    :type session_key: :class:`str`
+
+    :return: Session.
+    :rtype: Django session
+    """
+
+    return _engine.SessionStore(session_key)
+
+
+def get_user(session):
+    """
+    Returns Django User instance by session.
+
+    :param session: User's session.
+    :type session: Django session
+
+    :return: User.
+    :rtype: Django User
+    """
+
+    django_request = _Request()
+    django_request.session = session
+
+    return _get_user(django_request)
+
+
+def load_user(session_key):
+    """
+    Loads authenticated user by session key. Runs on thread pool.
+
+    :param session_key: Session key.
+    :type session_key: :class:`str`
+
+    :return: Authenticated user snapshot.
+    :rtype: :class:`Principal`
+
+    :raise: :class:`InvalidSessionKey` if session isn't authenticated.
+    """
+
+    db.close_old_connections()
+    user = get_user(get_session(session_key))
+    if not user.is_authenticated():
+        raise InvalidSessionKey('Session is not authenticated')
+    return Principal.from_user(user)
+
+
+class UserCache(object):
+    """
+    Size bounded session key to principal cache with expiration. Not thread
+    safe, use it from IOLoop thread only.
+    """
+
+    def __init__(self, size, ttl):
+        """
+        Initialize cache.
+
+        :param size: Max cached users count.
+        :type size: :class:`int`
+
+        :param ttl: Cached user lifetime in seconds.
+        :type ttl: :class:`float`
+        """
+
+        self.size = size
+        self.ttl = ttl
+        self._users = OrderedDict()
+
+    def get(self, session_key):
+        """
+        Get cached user.
+
+        :param session_key: Session key.
+        :type session_key: :class:`str`
+
+        :return: Principal or None if not cached or expired.
+        :rtype: :class:`Principal`
+        """
+
+        item = self._users.get(session_key)
+        if item is None:
+            return None
+        user, expires_at = item
+        if expires_at <= time.time():
+            del self._users[session_key]
+            return None
+        return user
+
+    def set(self, session_key, user):
+        """
+        Cache user. The oldest users are evicted if cache is full.
+
+        :param session_key: Session key.
+        :type session_key: :class:`str`
+
+        :param user: Principal.
+        :type user: :class:`Principal`
+        """
+
+        if self.size <= 0 or self.ttl <= 0:
+            return
+        self._users.pop(session_key, None)
+        self._users[session_key] = (user, time.time() + self.ttl)
+        while len(self._users) > self.size:
+            self._users.popitem(last=False)
+
+    def __len__(self):
+        return len(self._users)
+
+
+class Authenticator(object):
+    """
+    Authenticates websocket connections by session key.
+    """
+
+    def __init__(self,
+                 pool_size=event_settings.AUTH_POOL_SIZE,
+                 backlog=event_settings.AUTH_BACKLOG,
+                 cache_size=event_settings.AUTH_CACHE_SIZE,
+                 cache_ttl=event_settings.AUTH_CACHE_TTL):
+        """
+        Initialize authenticator.
+
+        :param pool_size: Authentication threads count.
+        :type pool_size: :class:`int`
+
+        :param backlog: Max sessions being authenticated at once.
+        :type backlog: :class:`int`
+
+        :param cache_size: Max cached users count.
+        :type cache_size: :class:`int`
+
+        :param cache_ttl: Cached user lifetime in seconds.
+        :type cache_ttl: :class:`float`
+        """
+
+        self.executor = ThreadPoolExecutor(max_workers=pool_size)
+        self.backlog = backlog
+        self.cache = UserCache(cache_size, cache_ttl)
+        self.pending = {}
+
+    @gen.coroutine
+    def authenticate(self, session_key):
+        """
+        Authenticates user by session key.
+
+        :param session_key: Session key.
+        :type session_key: :class:`str`
+
+        :return: Authenticated user snapshot.
+        :rtype: :class:`Principal`
+
+        :raise: :class:`InvalidSessionKey` if session isn't authenticated,
+            :class:`AuthBacklogFull` if backlog is too deep.
+        """
+
+        if not session_key:
+            raise InvalidSessionKey('Session id was not provided')
+
+        user = self.cache.get(session_key)
+        if user is not None:
+            raise gen.Return(user)
+
+        future = self.pending.get(session_key)
+        if future is None:
+            if len(self.pending) >= self.backlog:
+                raise AuthBacklogFull()
+            future = self.executor.submit(load_user, session_key)
+            self.pending[session_key] = future
+
+        try:
+            user = yield future
+        finally:
+            if self.pending.get(session_key) is future:
+                del self.pending[session_key]
+
+        self.cache.set(session_key, user)
+        raise gen.Return(user)
+
+
+authenticator = Authenticator()
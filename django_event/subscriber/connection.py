@@ -9,62 +9,29 @@ Provides basic websocket connection and subscribe/unsubscribe message system.
 from __future__ import unicode_literals
 
 import json
-from multiprocessing import cpu_count
+import logging
+import time
 
-from concurrent.futures import ThreadPoolExecutor
 from django import db
 from django.conf import settings
-from django.contrib.auth import get_user as _get_user
 from django.contrib.sessions.exceptions import InvalidSessionKey
-from django.utils.importlib import import_module
 from sockjs.tornado.conn import SockJSConnection
 from tornado import gen
-from tornado.concurrent import run_on_executor
+from tornado.ioloop import IOLoop
 
-from django_event.backends import Backend
+from django_event import settings as event_settings
+from django_event.subscriber.auth import AuthBacklogFull
+from django_event.subscriber.auth import authenticator
+from django_event.subscriber.drain import drainer
+from django_event.subscriber.hub import hub
 from django_event.subscriber.listeners import Listener
+from django_event.subscriber.outbound import OutboundQueue
+from django_event.subscriber.outbound import SlowConsumer
+from django_event.subscriber.outbound import TransportAdapter
+from django_event.utils import get_channel
 
 
-_engine = import_module(settings.SESSION_ENGINE)
-
-
-class _Request(object):
-    """
-    Private class that emulates Django Request class.
-    """
-
-    pass
-
-
-def get_session(session_key):
-    """
-    Returns Django session instance by session key.
-
-    :param session_key: Session key given through websocket.
-    :type session_key: :class:`str`
-
-    :return: Session.
-    :rtype: Django session
-    """
-
-    return _engine.SessionStore(session_key)
-
-
-def get_user(session):
-    """
-    Returns Django User instance by session.
-
-    :param session: User's session.
-    :type session: Django session
-
-    :return: User.
-    :rtype: Django User
-    """
-
-    django_request = _Request()
-    django_request.session = session
-
-    return _get_user(django_request)
+logger = logging.getLogger(__name__)
 
 
 class EventConnection(SockJSConnection):
@@ -72,8 +39,16 @@ class EventConnection(SockJSConnection):
     SockJS connection handler.
     """
 
-    # Thread pool for synchronous methods.
-    executor = ThreadPoolExecutor(max_workers=cpu_count())
+    # Close code sent when server can't authenticate connection now.
+    BUSY_CLOSE_CODE = 4503
+    # Close code sent when server is draining, client should reconnect after
+    # delay given in reconnect message.
+    RECONNECT_CLOSE_CODE = 4000
+    RECONNECT_MESSAGE_TYPE = 'reconnect'
+    # Close code sent when client doesn't keep up with outbound frames.
+    SLOW_CONSUMER_CLOSE_CODE = 4008
+    # Seconds between attempts to flush outbound queue into busy transport.
+    FLUSH_INTERVAL = 0.1
 
     def __init__(self, session):
         """
@@ -85,8 +60,12 @@ class EventConnection(SockJSConnection):
 
         super(EventConnection, self).__init__(session)
 
-        self.subscribers = {}
+        self.listeners = {}
         self.user = None
+        self.outbound = OutboundQueue(event_settings.OUTBOUND_QUEUE_SIZE,
+                                      event_settings.OUTBOUND_POLICY)
+        self.transport = TransportAdapter(session)
+        self._flush_timeout = None
 
     @gen.coroutine
     def on_open(self, request):
@@ -98,29 +77,41 @@ class EventConnection(SockJSConnection):
         :type request: Tornado Request
         """
 
+        if drainer.draining:
+            self.reconnect(drainer.get_reconnect_delay())
+            return
+
         try:
             self.user = yield self.authenticate(request)
+        except AuthBacklogFull:
+            logger.warning('Authentication backlog is full, connection '
+                           'rejected')
+            self.session.close(self.BUSY_CLOSE_CODE, 'Server is busy')
+            return
         except (db.Error, InvalidSessionKey):
             self.close()
+            return
+
+        if self.is_closed:
+            return
+        if drainer.draining:
+            self.reconnect(drainer.get_reconnect_delay())
+        else:
+            drainer.add(self)
 
-    @run_on_executor
     def authenticate(self, request):
         """
-        Authenticates user by session key.
+        Authenticates user by session key. See :class:`Authenticator`.
 
         :param request: Request given on connection open.
         :type request: Tornado Request
 
-        :return: Authenticated user.
-        :rtype: Django User
+        :return: Future of authenticated user.
+        :rtype: :class:`Future`
         """
 
-        user = get_user(get_session(request.get_cookie('sessionid').value))
-
-        if not user:
-            raise InvalidSessionKey('Session id was not provided')
-
-        return user
+        cookie = request.get_cookie(settings.SESSION_COOKIE_NAME)
+        return authenticator.authenticate(cookie and cookie.value)
 
     @gen.coroutine
     def on_message(self, message):
@@ -157,15 +148,60 @@ class EventConnection(SockJSConnection):
 
         subscribe_list = message.get('args', [])
         for subject in subscribe_list:
-            if subject not in self.subscribers:
-                self.subscribers[subject] = Backend.subscriber(channel=subject)
-                listener = yield Listener.get_listener(subject)
-                self.subscribers[subject].add_event_listener(
-                    listener,
-                    self.user,
-                    self.send
-                )
-                self.subscribers[subject].connect()
+            if subject in self.listeners:
+                continue
+            listener_class = yield Listener.get_listener(subject)
+            # Connection might be closed or subscribe the same subject while
+            # listener class was importing.
+            if self.is_closed:
+                return
+            if subject in self.listeners:
+                continue
+            listener = listener_class(self.user, self.send)
+            routing_strategies = event_settings.ROUTING_STRATEGIES.get(
+                subject, ())
+            subscribed = []
+            try:
+                for channel in self.get_channels(subject, listener):
+                    hub.subscribe(channel, listener, routing_strategies)
+                    subscribed.append(channel)
+            except Exception:
+                # Listener is registered only if all its channels are
+                # subscribed, so client can subscribe the subject again.
+                for channel in subscribed:
+                    hub.unsubscribe(channel, listener)
+                raise
+            self.listeners[subject] = listener
+
+    def get_channels(self, subject, listener):
+        """
+        Returns backend channels listener should be subscribed to. If
+        USER_CHANNELS setting is on user routed subjects are subscribed to
+        the user's channels and to the subject channel receiving broadcast
+        events. Strategies the user can't be routed by are skipped.
+
+        :param subject: Event type.
+        :type subject: :class:`str`
+
+        :param listener: Subject listener.
+        :type listener: :class:`Listener`
+
+        :return: Channels.
+        :rtype: :class:`set`
+        """
+
+        routing_strategies = event_settings.ROUTING_STRATEGIES.get(subject)
+        if not event_settings.USER_CHANNELS or not routing_strategies:
+            return {subject}
+
+        channels = {subject}
+        for routing_strategy in routing_strategies:
+            channel = get_channel(subject,
+                                  routing_strategy,
+                                  listener.get_routing_key(routing_strategy))
+            if channel is not None:
+                channels.add(channel)
+        return channels
 
     @gen.coroutine
     def wrong_message(self, message):
@@ -189,25 +225,124 @@ class EventConnection(SockJSConnection):
 
         subscribe_list = message.get('args', [])
         for subject in subscribe_list:
-            if subject in self.subscribers:
-                subscriber = self.subscribers.pop(subject)
-                subscriber.disconnect()
-                listener = yield Listener.get_listener(subject)
-                subscriber.remove_event_listener(listener)
+            if subject in self.listeners:
+                self.unsubscribe_listener(subject, self.listeners.pop(subject))
+
+    def unsubscribe_listener(self, subject, listener):
+        """
+        Removes subject listener from all its channels.
+
+        :param subject: Event type.
+        :type subject: :class:`str`
+
+        :param listener: Subject listener.
+        :type listener: :class:`Listener`
+        """
+
+        for channel in self.get_channels(subject, listener):
+            hub.unsubscribe(channel, listener)
 
     @gen.coroutine
-    def send(self, message, binary=False):
+    def send(self, message, binary=False, progress_key=None):
         """
-        Sends message to websocket.
+        Sends message to websocket. Message is queued while transport is
+        busy, see :mod:`django_event.subscriber.outbound`.
 
         :param message: JSON decoded message routed by on_message method.
         :type message: :class:`dict`
 
+        :param binary: Flag. True if message need to be send in binary.
+        :type binary: :class:`bool`
+
+        :param progress_key: Event id if message is progress change.
+        :type progress_key: :class:`str`
+        """
+
+        if self.is_closed:
+            return
+
+        pending = self.transport.pending()
+        if not self.outbound and self.transport_ready(pending):
+            self.send_frame(message, binary)
+            return
+
+        try:
+            self.outbound.put(message, binary, progress_key, pending)
+        except SlowConsumer:
+            logger.warning('Outbound queue of %r is full, slow consumer '
+                           'disconnected', self.user)
+            self.outbound.clear()
+            self.session.close(self.SLOW_CONSUMER_CLOSE_CODE, 'Slow consumer')
+            return
+        self.schedule_flush()
+
+    def transport_ready(self, pending):
+        """
+        Checks whether transport accepts frames. Frames waiting for the next
+        poll count toward outbound queue size, so polling clients still get
+        frames batched per poll.
+
+        :param pending: Frames waiting in transport.
+        :type pending: :class:`int`
+
+        :return: True if frame can be handed to transport.
+        :rtype: :class:`bool`
+        """
+
+        return pending < self.outbound.size and not self.transport.writing()
+
+    def send_frame(self, message, binary=False):
+        """
+        Hands frame to SockJS session.
+
+        :param message: Frame.
+        :type message: :class:`str`
+
         :param binary: Flag. True if message need to be send in binary.
         :type binary: :class:`bool`
         """
 
         super(EventConnection, self).send(message, binary)
+        self.transport.sent()
+
+    def schedule_flush(self):
+        """
+        Schedules outbound queue flush if it has frames.
+        """
+
+        if self.outbound and self._flush_timeout is None:
+            self._flush_timeout = IOLoop.current().add_timeout(
+                time.time() + self.FLUSH_INTERVAL, self.flush)
+
+    def flush(self):
+        """
+        Sends queued frames while transport isn't busy.
+        """
+
+        self._flush_timeout = None
+        if self.is_closed:
+            self.outbound.clear()
+            return
+
+        while (self.outbound and
+               self.transport_ready(self.transport.pending())):
+            message, binary = self.outbound.pop()
+            self.send_frame(message, binary)
+        self.schedule_flush()
+
+    def reconnect(self, delay):
+        """
+        Asks client to reconnect after delay and closes connection.
+
+        :param delay: Reconnect delay in seconds.
+        :type delay: :class:`float`
+        """
+
+        super(EventConnection, self).send(json.dumps({
+            'type': self.RECONNECT_MESSAGE_TYPE,
+            'delay': delay,
+        }))
+        self.session.close(self.RECONNECT_CLOSE_CODE, 'Server is restarting')
 
     @gen.coroutine
     def on_close(self):
@@ -217,5 +352,11 @@ class EventConnection(SockJSConnection):
         Unsubscribes all event listeners.
         """
 
-        for subscriber in self.subscribers.itervalues():
-            subscriber.disconnect()
+        drainer.remove(self)
+        self.outbound.clear()
+        if self._flush_timeout is not None:
+            IOLoop.current().remove_timeout(self._flush_timeout)
+            self._flush_timeout = None
+        for subject, listener in self.listeners.iteritems():
+            self.unsubscribe_listener(subject, listener)
+        self.listeners.clear()
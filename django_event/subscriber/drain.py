@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+"""
+Connection drain module.
+Tracks open websocket connections of the current process and closes them
+gradually on shutdown, so clients don't reconnect all at once.
+"""
+
+
+from __future__ import unicode_literals
+
+import functools
+import random
+
+from tornado.ioloop import IOLoop
+
+
+class Drainer(object):
+    """
+    Process-wide registry of open connections.
+
+    On drain connections are asked to reconnect in random order spread over
+    the drain window, each with random reconnect delay.
+    """
+
+    def __init__(self):
+        """
+        Initialize drainer.
+        """
+
+        self.connections = set()
+        self.draining = False
+        self.reconnect_delay = 0
+
+    def add(self, connection):
+        """
+        Registers open connection.
+
+        :param connection: Connection.
+        :type connection: :class:`EventConnection`
+        """
+
+        self.connections.add(connection)
+
+    def remove(self, connection):
+        """
+        Unregisters closed connection.
+
+        :param connection: Connection.
+        :type connection: :class:`EventConnection`
+        """
+
+        self.connections.discard(connection)
+
+    def get_reconnect_delay(self):
+        """
+        Computes jittered reconnect delay.
+
+        :return: Reconnect delay in seconds.
+        :rtype: :class:`float`
+        """
+
+        return round(random.uniform(0, self.reconnect_delay), 3)
+
+    def drain(self, window, reconnect_delay, callback=None):
+        """
+        Starts draining. Does nothing if already draining.
+
+        :param window: Seconds to spread connections closing over.
+        :type window: :class:`float`
+
+        :param reconnect_delay: Max reconnect delay sent to clients in
+            seconds.
+        :type reconnect_delay: :class:`float`
+
+        :param callback: Called when drain window is over.
+        :type callback: callable object
+        """
+
+        if self.draining:
+            return
+        self.draining = True
+        self.reconnect_delay = reconnect_delay
+
+        io_loop = IOLoop.current()
+        connections = list(self.connections)
+        random.shuffle(connections)
+        step = float(window) / len(connections) if connections else 0
+        start = io_loop.time()
+
+        for index, connection in enumerate(connections):
+            io_loop.add_timeout(
+                start + index * step,
+                functools.partial(self.close, connection)
+            )
+        if callback is not None:
+            io_loop.add_timeout(start + window, callback)
+
+    def close(self, connection):
+        """
+        Asks connection client to reconnect and closes connection.
+
+        :param connection: Connection.
+        :type connection: :class:`EventConnection`
+        """
+
+        self.remove(connection)
+        if not connection.is_closed:
+            connection.reconnect(self.get_reconnect_delay())
+
+
+drainer = Drainer()
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+"""
+Message envelope module.
+"""
+
+
+from __future__ import unicode_literals
+
+import json
+
+from django.utils.functional import cached_property
+
+
+class Envelope(object):
+    """
+    Consumed message wrapper shared between all listeners of the subscriber.
+    Message body is decoded and outgoing frame is encoded at most once no
+    matter how many listeners received the message.
+    """
+
+    def __init__(self, body):
+        """
+        Initialize envelope.
+
+        :param body: Consumed message's body.
+        :type body: :class:`str`
+        """
+
+        self.body = body
+
+    @cached_property
+    def data(self):
+        """
+        Decoded message.
+
+        :return: JSON decoded message body.
+        :rtype: :class:`dict`
+        """
+
+        return json.loads(self.body)
+
+    @property
+    def routing_strategy(self):
+        """
+        Shortcut for message routing strategy.
+
+        :return: Routing strategy.
+        :rtype: :class:`str`
+        """
+
+        return self.data.get('routing_strategy')
+
+    @property
+    def routing_key(self):
+        """
+        Shortcut for message routing key.
+
+        :return: Routing key.
+        :rtype: :class:`str`
+        """
+
+        return self.data.get('routing_key')
+
+    @cached_property
+    def progress_key(self):
+        """
+        Event id of progress change message. Queued progress frames of the
+        same event may be coalesced or dropped for slow clients.
+
+        :return: Event id or None if message isn't progress change.
+        :rtype: :class:`str`
+        """
+
+        message = self.data.get('message')
+        if not isinstance(message, dict) or len(message) != 1:
+            return None
+        event_id, body = next(iter(message.items()))
+        if isinstance(body, dict) and body.get('action') == 'progress_change':
+            return event_id
+        return None
+
+    @cached_property
+    def frame(self):
+        """
+        Outgoing frame sent to websocket clients.
+
+        :return: JSON encoded message payload.
+        :rtype: :class:`str`
+        """
+
+        return json.dumps(self.data['message'])
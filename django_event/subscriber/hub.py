@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+
+"""
+Subscription hub module.
+Shares one backend subscriber per channel between all websocket connections
+of the current process and fans consumed messages out to their listeners.
+"""
+
+
+from __future__ import unicode_literals
+
+from django_event.backends import Backend
+
+
+class SubscriptionHub(object):
+    """
+    Process-wide registry of backend subscribers.
+
+    Each channel has exactly one backend subscriber no matter how many
+    connections listen to it. Listeners are reference counted per channel and
+    the subscriber is disconnected as soon as its last listener is removed.
+    """
+
+    def __init__(self):
+        """
+        Initialize hub.
+        """
+
+        self.subscribers = {}
+        self.listeners = {}
+
+    def subscribe(self, channel, listener, routing_strategies=()):
+        """
+        Adds listener to the channel subscriber. Creates and connects
+        subscriber if the channel has no listeners yet. If subscriber fails
+        to connect hub is left unchanged and the error is raised.
+
+        :param channel: Backend channel.
+        :type channel: :class:`str`
+
+        :param listener: Listener instance.
+        :type listener: :class:`Listener`
+
+        :param routing_strategies: Routing strategies known for the channel.
+         Subscriber indexes listeners by them in advance.
+        :type routing_strategies: iterable of :class:`str`
+        """
+
+        listeners = self.listeners.get(channel, ())
+        if listener in listeners:
+            return
+
+        subscriber = self.subscribers.get(channel)
+        if subscriber is None:
+            subscriber = Backend.subscriber(channel=channel)
+            # Subscriber is registered only when connected, failed one isn't
+            # shared with later connections.
+            subscriber.connect()
+            self.subscribers[channel] = subscriber
+
+        for routing_strategy in routing_strategies:
+            subscriber.index_routing_strategy(routing_strategy)
+        self.listeners.setdefault(channel, set()).add(listener)
+        subscriber.add_event_listener(listener)
+
+    def unsubscribe(self, channel, listener):
+        """
+        Removes listener from the channel subscriber. Disconnects subscriber
+        if it was the last channel listener.
+
+        :param channel: Backend channel.
+        :type channel: :class:`str`
+
+        :param listener: Listener instance.
+        :type listener: :class:`Listener`
+        """
+
+        listeners = self.listeners.get(channel)
+        if not listeners or listener not in listeners:
+            return
+
+        listeners.remove(listener)
+        subscriber = self.subscribers[channel]
+        # Listeners of the same user compare equal, so the exact instance is
+        # discarded here instead of using remove_event_listener.
+        subscriber.discard_event_listener(listener)
+
+        if not listeners:
+            del self.listeners[channel]
+            del self.subscribers[channel]
+            subscriber.disconnect()
+
+    def listeners_count(self, channel):
+        """
+        Returns number of listeners subscribed to the channel.
+
+        :param channel: Backend channel.
+        :type channel: :class:`str`
+
+        :return: Listeners count.
+        :rtype: :class:`int`
+        """
+
+        return len(self.listeners.get(channel, ()))
+
+
+hub = SubscriptionHub()
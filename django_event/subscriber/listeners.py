@@ -7,15 +7,14 @@ Base listener module.
 
 from __future__ import unicode_literals
 
-import json
 from multiprocessing import cpu_count
 
 from concurrent.futures import ThreadPoolExecutor
 from django.utils.lru_cache import lru_cache
 from tornado.ioloop import IOLoop
-from tornado.concurrent import run_on_executor
 
 from django_event import settings
+from django_event.subscriber.principal import Principal
 from django_event.utils import get_routing
 from django_event.utils import import_var
 
@@ -26,18 +25,22 @@ class Listener(object):
     """
 
     executor = ThreadPoolExecutor(max_workers=cpu_count())
-    io_loop = IOLoop.current()
+
+    # Routed listeners receive only messages matched their routing key, so
+    # subscribers deliver messages to them through routing index.
+    routed = False
 
     def __init__(self, user):
         """
         Initialize listener.
 
-        :param user: Django user instance
-        :type user: User
+        :param user: Authenticated user.
+        :type user: :class:`Principal` or User
         """
 
         self._user = user
         self._routing_key = None
+        self._routing_keys = None
         self._message = None
 
     def __eq__(self, other):
@@ -51,18 +54,44 @@ class Listener(object):
     def __ne__(self, other):
         return not (self == other)
 
+    @property
+    def io_loop(self):
+        """
+        Current IOLoop. Resolved lazily, so importing listeners doesn't
+        initialize IOLoop before server processes are forked.
+
+        :return: IOLoop.
+        :rtype: :class:`IOLoop`
+        """
+
+        return IOLoop.current()
+
     @classmethod
-    @run_on_executor
-    @lru_cache()
     def get_listener(cls, event_type):
         """
         Fabric method for listener subclasses.
-        Imports listener by type and returns it.
+        Imports listener by type on thread pool.
 
         :param event_type: Event type.
         :type event_type: :class:`str`
 
-        :return: Listener module that will process certain type of messages.
+        :return: Future of listener class that will process certain type of
+            messages.
+        :rtype: :class:`Future`
+        """
+
+        return cls.executor.submit(cls.import_listener, event_type)
+
+    @staticmethod
+    @lru_cache()
+    def import_listener(event_type):
+        """
+        Imports listener by type.
+
+        :param event_type: Event type.
+        :type event_type: :class:`str`
+
+        :return: Listener class.
         :rtype: :class:`Listener` subclass
         """
 
@@ -73,13 +102,41 @@ class Listener(object):
         Abstract method. Specifies on message behaviour.
 
         :param message: Received message.
-        :type message: :class:`str`
+        :type message: :class:`Envelope`
 
         :raise: NotImplementedError
         """
 
         raise NotImplementedError
 
+    def get_routing_key(self, routing_strategy):
+        """
+        Computes routing key for current user. Principals have precomputed
+        routing keys, for other users routing keys are cached per routing
+        strategy.
+
+        :param routing_strategy: Routing strategy.
+        :type routing_strategy: :class:`str`
+
+        :return: Routing key or None if user can't be routed by strategy.
+        :rtype: :class:`str`
+        """
+
+        if isinstance(self._user, Principal):
+            return self._user.get_routing_key(routing_strategy)
+
+        if self._routing_keys is None:
+            self._routing_keys = {}
+        elif routing_strategy in self._routing_keys:
+            return self._routing_keys[routing_strategy]
+
+        try:
+            routing_key = get_routing(self._user, routing_strategy)
+        except AttributeError:
+            routing_key = None
+        self._routing_keys[routing_strategy] = routing_key
+        return routing_key
+
     def routing_matched(self):
         """
         Computes routing key for current user and compares with received
@@ -89,9 +146,9 @@ class Listener(object):
         :rtype: :class:`bool`
         """
 
-        self._routing_key = get_routing(self._user,
-                                        self._message['routing_strategy'])
-        return self._routing_key == self._message['routing_key']
+        self._routing_key = self.get_routing_key(
+            self._message.routing_strategy)
+        return self._routing_key == self._message.routing_key
 
 
 class SendMessageListener(Listener):
@@ -99,12 +156,14 @@ class SendMessageListener(Listener):
     Base listener for send message through SockJS connection.
     """
 
+    routed = True
+
     def __init__(self, user, sender):
         """
         Initialize listener.
 
-        :param user: Django user instance.
-        :type user: User
+        :param user: Authenticated user.
+        :type user: :class:`Principal` or User
 
         :param sender: Send function
         :type sender: callable object
@@ -119,9 +178,9 @@ class SendMessageListener(Listener):
         Sends message if routing key matched.
 
         :param message: Received message.
-        :type message: :class:`str`
+        :type message: :class:`Envelope`
         """
 
-        self._message = json.loads(message)
+        self._message = message
         if self.routing_matched():
-            self.sender(json.dumps(self._message['message']))
\ No newline at end of file
+            self.sender(message.frame, progress_key=message.progress_key)
\ No newline at end of file
@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+
+"""
+Outbound queue module.
+Frames are queued per connection while the client isn't keeping up, so slow
+clients don't accumulate unbounded transport buffers. Full queue is handled
+by policy:
+
+* ``drop_oldest`` - the oldest queued progress frame is dropped.
+* ``coalesce`` - progress frame replaces queued progress frame of the same
+  event, the oldest progress frame is dropped if there is none.
+* ``disconnect`` - slow client is disconnected.
+
+Client is disconnected under any policy if queue has no progress frames to
+drop. Frames already handed to SockJS session but not yet delivered, e.g.
+waiting for the next poll, count toward the queue size but can't be dropped
+or coalesced.
+"""
+
+
+from __future__ import unicode_literals
+
+from collections import deque
+
+from django.conf import ImproperlyConfigured
+
+
+DROP_OLDEST = 'drop_oldest'
+COALESCE = 'coalesce'
+DISCONNECT = 'disconnect'
+
+POLICIES = (DROP_OLDEST, COALESCE, DISCONNECT)
+
+
+class SlowConsumer(Exception):
+    """
+    Raised when frame can't be queued.
+    """
+
+
+class OutboundStats(object):
+    """
+    Process-wide outbound queues counters.
+    """
+
+    def __init__(self):
+        """
+        Initialize counters.
+        """
+
+        self.dropped = 0
+        self.coalesced = 0
+        self.disconnected = 0
+
+
+class OutboundQueue(object):
+    """
+    Bounded queue of frames waiting for transport.
+    """
+
+    def __init__(self, size, policy):
+        """
+        Initialize queue.
+
+        :param size: Max queued frames count.
+        :type size: :class:`int`
+
+        :param policy: Full queue policy, one of :data:`POLICIES`.
+        :type policy: :class:`str`
+
+        :raise: :class:`ImproperlyConfigured` if policy is unknown.
+        """
+
+        if policy not in POLICIES:
+            raise ImproperlyConfigured(
+                'Unknown outbound policy %s, choose one of %s' % (
+                    policy, ', '.join(POLICIES))
+            )
+
+        self.size = size
+        self.policy = policy
+        self.frames = deque()
+        self.dropped = 0
+        self.coalesced = 0
+
+    def put(self, frame, binary=False, progress_key=None, pending=0):
+        """
+        Queues frame.
+
+        :param frame: Frame.
+        :type frame: :class:`str`
+
+        :param binary: Flag. True if frame need to be send in binary.
+        :type binary: :class:`bool`
+
+        :param progress_key: Event id if frame is progress change, see
+            :attr:`Envelope.progress_key`.
+        :type progress_key: :class:`str`
+
+        :param pending: Frames waiting in transport, see
+            :func:`TransportAdapter.pending`.
+        :type pending: :class:`int`
+
+        :raise: :class:`SlowConsumer` if frame can't be queued.
+        """
+
+        if progress_key is not None and self.policy == COALESCE:
+            for item in self.frames:
+                if item[0] == progress_key:
+                    item[1] = frame
+                    item[2] = binary
+                    self.coalesced += 1
+                    stats.coalesced += 1
+                    return
+
+        while len(self.frames) + pending >= self.size:
+            if self.policy == DISCONNECT or not self.drop_progress():
+                stats.disconnected += 1
+                raise SlowConsumer()
+
+        self.frames.append([progress_key, frame, binary])
+
+    def drop_progress(self):
+        """
+        Drops the oldest queued progress frame.
+
+        :return: True if frame was dropped.
+        :rtype: :class:`bool`
+        """
+
+        for index, item in enumerate(self.frames):
+            if item[0] is not None:
+                del self.frames[index]
+                self.dropped += 1
+                stats.dropped += 1
+                return True
+        return False
+
+    def pop(self):
+        """
+        Removes the oldest queued frame.
+
+        :return: Frame and binary flag.
+        :rtype: :class:`tuple`
+        """
+
+        progress_key, frame, binary = self.frames.popleft()
+        return frame, binary
+
+    def clear(self):
+        """
+        Removes all queued frames.
+        """
+
+        self.frames.clear()
+
+    def __len__(self):
+        return len(self.frames)
+
+
+class TransportAdapter(object):
+    """
+    Inspects SockJS transport of a session. All knowledge of sockjs-tornado
+    and Tornado internals is kept here. Supports sockjs-tornado 1.0 with
+    Tornado 4, missing attributes are treated as idle transport.
+
+    Frames handed to session while no poll request is attached wait in
+    session ``send_queue`` and are delivered together with the next poll.
+    Streaming transports and websockets write frames right away, they are
+    busy while socket write buffer isn't empty.
+    """
+
+    def __init__(self, session):
+        """
+        Initialize adapter.
+
+        :param session: SockJS session.
+        :type session: :class:`sockjs.tornado.session.Session`
+        """
+
+        self.session = session
+        self.queued = 0
+
+    def pending(self):
+        """
+        Frames handed to session but waiting for the client.
+
+        :return: Pending frames count.
+        :rtype: :class:`int`
+        """
+
+        if not getattr(self.session, 'send_queue', None):
+            self.queued = 0
+        return self.queued
+
+    def sent(self):
+        """
+        Records frame handed to session.
+        """
+
+        if getattr(self.session, 'send_queue', None):
+            self.queued += 1
+        else:
+            self.queued = 0
+
+    def get_stream(self):
+        """
+        Get stream of active transport handler.
+
+        :return: Stream or None if no handler is active.
+        :rtype: :class:`tornado.iostream.IOStream`
+        """
+
+        handler = getattr(self.session, 'handler', None)
+        if handler is None or not getattr(handler, 'active', False):
+            return None
+        # Websocket handlers detach stream from HTTP connection.
+        stream = getattr(handler, 'stream', None)
+        if stream is None:
+            connection = getattr(getattr(handler, 'request', None),
+                                 'connection', None)
+            stream = getattr(connection, 'stream', None)
+        return stream
+
+    def writing(self):
+        """
+        Checks whether active transport is still writing previous frames.
+
+        :return: True if socket write buffer isn't empty.
+        :rtype: :class:`bool`
+        """
+
+        writing = getattr(self.get_stream(), 'writing', None)
+        return bool(writing is not None and writing())
+
+
+stats = OutboundStats()
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+
+"""
+Compact authenticated user representation for websocket connections.
+"""
+
+
+from __future__ import unicode_literals
+
+import logging
+
+from django_event import settings
+from django_event.utils import get_routing
+
+
+logger = logging.getLogger(__name__)
+
+
+# Routing strategies precomputed for every principal, configured by
+# ROUTING_STRATEGIES setting.
+STRATEGIES = tuple(sorted(set(
+    strategy
+    for strategies in settings.ROUTING_STRATEGIES.values()
+    for strategy in strategies
+    if strategy
+)))
+
+_STRATEGY_INDEX = dict(
+    (strategy, index) for index, strategy in enumerate(STRATEGIES)
+)
+
+# Undeclared routing strategies principals can't be routed by, warned once.
+_UNROUTABLE_STRATEGIES = set()
+
+
+class Principal(object):
+    """
+    Authenticated user snapshot. Holds user id, username and routing keys of
+    all configured routing strategies, so messages are routed without
+    touching user model. Routing keys of strategies missing in
+    ROUTING_STRATEGIES setting are computed from principal on first use and
+    cached.
+    """
+
+    __slots__ = ('pk', 'username', 'routing_keys', '_extra_routing_keys')
+
+    def __init__(self, pk, username, routing_keys):
+        """
+        Initialize principal.
+
+        :param pk: User id.
+        :type pk: :class:`int`
+
+        :param username: User name.
+        :type username: :class:`str`
+
+        :param routing_keys: Routing keys ordered as :data:`STRATEGIES`.
+        :type routing_keys: :class:`tuple`
+        """
+
+        self.pk = pk
+        self.username = username
+        self.routing_keys = routing_keys
+        self._extra_routing_keys = None
+
+    @classmethod
+    def from_user(cls, user):
+        """
+        Builds principal of Django user. Computes routing keys, so it may
+        query database for related objects.
+
+        :param user: Django user.
+        :type user: User
+
+        :return: Principal.
+        :rtype: :class:`Principal`
+        """
+
+        routing_keys = []
+        for strategy in STRATEGIES:
+            try:
+                routing_keys.append(get_routing(user, strategy))
+            except AttributeError:
+                routing_keys.append(None)
+        return cls(user.pk, user.get_username(), tuple(routing_keys))
+
+    @property
+    def id(self):
+        return self.pk
+
+    def get_routing_key(self, routing_strategy):
+        """
+        Get routing key. Keys of strategies missing in ROUTING_STRATEGIES
+        setting are computed once, see :func:`compute_routing_key`.
+
+        :param routing_strategy: Routing strategy.
+        :type routing_strategy: :class:`str`
+
+        :return: Routing key or None if user can't be routed by strategy.
+        :rtype: :class:`str`
+        """
+
+        if not routing_strategy:
+            return ''
+        index = _STRATEGY_INDEX.get(routing_strategy)
+        if index is not None:
+            return self.routing_keys[index]
+
+        if self._extra_routing_keys is None:
+            self._extra_routing_keys = {}
+        elif routing_strategy in self._extra_routing_keys:
+            return self._extra_routing_keys[routing_strategy]
+
+        routing_key = self.compute_routing_key(routing_strategy)
+        self._extra_routing_keys[routing_strategy] = routing_key
+        return routing_key
+
+    def compute_routing_key(self, routing_strategy):
+        """
+        Computes routing key of strategy missing in ROUTING_STRATEGIES
+        setting. Only strategies like ``user.id`` or ``user.username`` can be
+        computed by principal itself, as it's called on IOLoop thread and
+        can't query database. Declare other strategies in ROUTING_STRATEGIES
+        setting, so they are computed on authentication.
+
+        :param routing_strategy: Routing strategy.
+        :type routing_strategy: :class:`str`
+
+        :return: Routing key or None if user can't be routed by strategy.
+        :rtype: :class:`str`
+        """
+
+        try:
+            return get_routing(self, routing_strategy)
+        except AttributeError:
+            pass
+
+        if routing_strategy not in _UNROUTABLE_STRATEGIES:
+            _UNROUTABLE_STRATEGIES.add(routing_strategy)
+            logger.warning('Routing strategy %s is missing in '
+                           'ROUTING_STRATEGIES setting, messages routed by '
+                           'it are not delivered', routing_strategy)
+        return None
+
+    def __eq__(self, other):
+        return isinstance(other, Principal) and self.pk == other.pk
+
+    def __ne__(self, other):
+        return not (self == other)
+
+    def __hash__(self):
+        return hash(self.pk)
+
+    def __repr__(self):
+        return '<Principal: %s>' % self.username
@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+
+"""
+Django event tests. Run them with test settings::
+
+    django-admin.py test django_event --settings=django_event.tests.settings
+"""
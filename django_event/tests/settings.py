@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+
+"""
+Minimal settings to run django-event tests.
+"""
+
+from __future__ import unicode_literals
+
+
+SECRET_KEY = 'django-event-tests'
+
+INSTALLED_APPS = (
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django_event',
+)
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    }
+}
+
+MIDDLEWARE_CLASSES = ()
+
+USE_TZ = True
+
+DJANGO_EVENT = {
+    'LISTENERS': {
+        'test': 'django_event.subscriber.listeners.SendMessageListener',
+    },
+    'ROUTING_STRATEGIES': {
+        'test': ('user.id', ),
+    },
+}
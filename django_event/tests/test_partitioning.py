@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+
+"""
+Event table partitioning tests. Run them with PostgreSQL 11+ database.
+"""
+
+from __future__ import unicode_literals
+
+from datetime import timedelta
+from unittest import skipUnless
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase
+
+from django_event import partitioning
+from django_event.models import Event
+from django_event.models import EventCounter
+
+
+def partitioning_supported():
+    return (connection.vendor == 'postgresql' and
+            connection.pg_version >= 110000)
+
+
+@skipUnless(partitioning_supported(), 'Requires PostgreSQL 11+')
+class PartitioningTestCase(TestCase):
+    """
+    Checks event table conversion and partitions maintenance.
+    """
+
+    def setUp(self):
+        # Migrations partition the table if PARTITIONING setting is on, tests
+        # start from regular table anyway. Conversion is rolled back.
+        if partitioning.is_partitioned(Event):
+            partitioning.unpartition_table(Event)
+        self.user = User.objects.create_user('owner')
+        self.today = partitioning.today()
+        self.cursor = connection.cursor()
+
+    def create_event(self, days_ago, viewed=False):
+        event = Event(user=self.user, type='test', task_name='test_task',
+                      viewed=viewed)
+        event.save()
+        Event.objects.filter(pk=event.pk).update(
+            created_at=partitioning.to_datetime(
+                self.today - timedelta(days=days_ago)
+            )
+        )
+        return event
+
+    def partition_table(self):
+        # Conversion can't alter tables with pending deferred checks.
+        self.cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+        partitioning.partition_table(Event, partitioning.DAILY, ahead=2,
+                                     store_days=3)
+
+    def get_definitions(self):
+        return partitioning.get_table_definitions(
+            self.cursor, Event._meta.db_table, connection.ops.quote_name
+        )
+
+    def get_partition(self, event):
+        self.cursor.execute(
+            'SELECT tableoid::regclass::text FROM django_event_event '
+            'WHERE id = %s', [event.pk]
+        )
+        return self.cursor.fetchone()[0]
+
+    def test_partition_table(self):
+        """
+        Rows, indexes and constraints are kept, rows out of partitions go to
+        the default partition.
+        """
+
+        old = self.create_event(10)
+        recent = self.create_event(1)
+        primary_key, definitions = self.get_definitions()
+
+        self.partition_table()
+
+        self.assertTrue(partitioning.is_partitioned(Event))
+        names = [name for name, start, end
+                 in partitioning.get_partitions(Event)]
+        self.assertEqual(names, [
+            partitioning.partition_name(
+                'django_event_event', self.today + timedelta(days=days)
+            )
+            for days in range(-3, 3)
+        ])
+        self.assertEqual(self.get_partition(old),
+                         'django_event_event_default')
+        self.assertEqual(
+            self.get_partition(recent),
+            partitioning.partition_name('django_event_event',
+                                        self.today - timedelta(days=1))
+        )
+        self.assertEqual(self.get_definitions(), (primary_key, definitions))
+
+        event = self.create_event(0)
+        self.assertEqual(Event.objects.get(pk=event.pk).user, self.user)
+        self.assertGreater(event.pk, recent.pk)
+
+        partitioning.unpartition_table(Event)
+        self.assertFalse(partitioning.is_partitioned(Event))
+        self.assertEqual(self.get_definitions(), (primary_key, definitions))
+        self.assertEqual(Event.objects.count(), 3)
+
+    def test_create_partitions(self):
+        """
+        Partitions are created after the last one, rows are moved into them
+        from the default partition.
+        """
+
+        self.partition_table()
+        event = self.create_event(-5)
+        self.assertEqual(self.get_partition(event),
+                         'django_event_event_default')
+
+        created = partitioning.create_partitions(Event, ahead=5,
+                                                 interval=partitioning.DAILY)
+
+        self.assertEqual(created, [
+            partitioning.partition_name(
+                'django_event_event', self.today + timedelta(days=days)
+            )
+            for days in range(3, 6)
+        ])
+        self.assertEqual(self.get_partition(event), created[-1])
+
+    def test_drop_expired_partitions(self):
+        """
+        Expired partitions are dropped, not viewed counters are decremented.
+        """
+
+        self.create_event(3)
+        self.create_event(3, viewed=True)
+        kept = self.create_event(2)
+        self.partition_table()
+        self.assertEqual(Event.objects.not_viewed_count(self.user), 2)
+
+        dropped = partitioning.drop_expired_partitions(Event, store_days=2)
+
+        self.assertEqual(dropped, [partitioning.partition_name(
+            'django_event_event', self.today - timedelta(days=3)
+        )])
+        self.assertEqual(list(Event.objects.values_list('pk', flat=True)),
+                         [kept.pk])
+        self.assertEqual(Event.objects.not_viewed_count(self.user), 1)
+        self.assertEqual(EventCounter.objects.reconcile([self.user.pk]), 0)
+
+    def test_command_requires_partitioned_table(self):
+        """
+        Command doesn't touch regular table.
+        """
+
+        with self.assertRaises(CommandError):
+            call_command('partitionevents', verbosity=0)
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+"""
+Event views tests.
+"""
+
+from __future__ import unicode_literals
+
+from django.contrib.auth.models import User
+from django.test import RequestFactory
+from django.test import TestCase
+
+from django_event import settings
+from django_event.models import Event
+from django_event.publisher.views import EventDetailView
+from django_event.publisher.views import EventListView
+from django_event.publisher.views import MarkViewedView
+
+
+class EventViewsQueriesTestCase(TestCase):
+    """
+    Checks event views don't load whole user events.
+    """
+
+    events_count = 25
+
+    def setUp(self):
+        self.user = User.objects.create_user('owner')
+        Event.objects.bulk_create([
+            Event(user=self.user, type='test', task_id='task-%s' % i,
+                  task_name='test_task')
+            for i in range(self.events_count)
+        ])
+        self.request = RequestFactory().get('/')
+        self.request.user = self.user
+
+    def test_list(self):
+        """
+        Condition state, page existence, paginator count and page itself.
+        """
+
+        with self.assertNumQueries(4):
+            response = EventListView.as_view()(self.request)
+            events = list(response.context_data['object_list'])
+        self.assertEqual(len(events), EventListView.paginate_by)
+
+    def test_detail(self):
+        """
+        Condition state and event itself.
+        """
+
+        pk = Event.objects.filter(user=self.user).latest('pk').pk
+        with self.assertNumQueries(2):
+            response = EventDetailView.as_view()(self.request, pk=str(pk))
+        self.assertEqual(response.context_data['object'].pk, pk)
+
+
+class MarkViewedViewTestCase(TestCase):
+    """
+    Checks viewed endpoint limits ids count.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user('owner')
+        self.factory = RequestFactory()
+
+    def post(self, data):
+        request = self.factory.post('/', data)
+        request.user = self.user
+        return MarkViewedView.as_view()(request)
+
+    def test_ids_limit(self):
+        """
+        Too many ids are rejected, up_to is accepted instead.
+        """
+
+        ids = list(range(1, settings.VIEWED_MAX_IDS + 2))
+        self.assertEqual(self.post({'ids': ids}).status_code, 400)
+        self.assertEqual(self.post({'ids': ids[:-1]}).status_code, 200)
+        self.assertEqual(self.post({'up_to': ids[-1]}).status_code, 200)
@@ -9,6 +9,8 @@ from __future__ import unicode_literals
 
 import importlib
 
+from django_event import settings
+
 
 def import_var(var_path):
     """
@@ -50,10 +52,13 @@ def get_routing(user, routing_strategy):
     :param routing_strategy: How it can compute routing key.
     :type routing_strategy: :class:`str`
 
-    :return: Routing key for RabbitMQ.
+    :return: Routing key for RabbitMQ. Empty string for empty strategy.
     :rtype: :class:`str`
     """
 
+    if not routing_strategy:
+        return ''
+
     routing = routing_strategy.split('.')
     source = user
     if routing[0] == 'user':
@@ -63,6 +68,61 @@ def get_routing(user, routing_strategy):
     return str(source)
 
 
+def get_channel(event_type, routing_strategy, routing_key):
+    """
+    Get backend channel for event type. Events with routing strategy are
+    published into per routing strategy and key channels if USER_CHANNELS
+    setting is on, e.g. ``example_event_type.user.id.1``.
+
+    :param event_type: Event type.
+    :type event_type: :class:`str`
+
+    :param routing_strategy: Routing strategy.
+    :type routing_strategy: :class:`str`
+
+    :param routing_key: Routing key computed by strategy.
+    :type routing_key: :class:`str`
+
+    :return: Channel name or None if routing key is None.
+    :rtype: :class:`str`
+    """
+
+    if settings.USER_CHANNELS and routing_strategy:
+        if routing_key is None:
+            return None
+        return '%s.%s.%s' % (event_type, routing_strategy, routing_key)
+    return event_type
+
+
+def parse_ids(values):
+    """
+    Parses ids passed as list or comma separated string.
+
+    :param values: Ids e.g. ``['1', '2']`` or ``'1,2'``.
+    :type values: :class:`list` or :class:`str`
+
+    :return: Ids.
+    :rtype: :class:`list`
+
+    :raise: :class:`ValueError` if any id isn't positive integer.
+    """
+
+    if not isinstance(values, (list, tuple)):
+        values = [values]
+
+    ids = []
+    for value in values:
+        for item in ('%s' % value).split(','):
+            item = item.strip()
+            if not item:
+                continue
+            item = int(item)
+            if item <= 0:
+                raise ValueError('Invalid id %s' % item)
+            ids.append(item)
+    return ids
+
+
 def try_import_or_runtime_error(module, message):
     """
 
@@ -64,12 +64,26 @@ DJANGO_EVENT = {
 
     'TORNADO_OPTIONS': {
         'HOST': '/',
-        'PORT': 8989
+        'PORT': 8989,
+        # 'PROCESSES': 1,
+        # 'MAX_RESTARTS': 100,
+        # 'METRICS_INTERVAL': 60,
+        # 'DRAIN_WINDOW': 30,
+        # 'RECONNECT_DELAY': 10,
     },
+    # 'OUTBOUND_QUEUE_SIZE': 100,
+    # 'OUTBOUND_POLICY': 'coalesce',
     'LISTENERS': {
         'example_event_type':
         'django_event.subscriber.listeners.SendMessageListener',
+        'events_viewed':
+        'django_event.subscriber.listeners.SendMessageListener',
+    },
+    'ROUTING_STRATEGIES': {
+        'example_event_type': ('user.id', ),
+        'events_viewed': ('user.id', ),
     },
+    'USER_CHANNELS': False,
     'STORE_DAYS': 7,
 }
 